@@ -1,6 +1,5 @@
 # script to debug main.py commands
 
-import argparse
 import sys
 from pathlib import Path
 
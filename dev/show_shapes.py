@@ -1,12 +1,59 @@
 import geopandas as gpd
 import pandas as pd
+import numpy as np
+import shapely
 import matplotlib.pyplot as plt
-from matplotlib import cm
-import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.path import Path
 from shapely.geometry.base import BaseGeometry
 import contextily as ctx
 
 
+def polygon_paths(geoms):
+    """
+    Converts (Multi)Polygons into matplotlib Paths in batch, one compound Path (exterior + holes) per polygon part.
+
+    Args:
+        geoms: Array-like of Polygon / MultiPolygon geometries
+
+    Returns:
+        Tuple of (list of Paths, array with the index of the input geometry of each Path)
+    """
+    parts, part_owner = shapely.get_parts(np.asarray(geoms), return_index=True)
+    # exterior rings counter-clockwise and holes clockwise, so holes are not filled
+    parts = shapely.orient_polygons(parts)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+
+    # MOVETO at the start of each ring, CLOSEPOLY at its end
+    ring_starts = np.flatnonzero(np.r_[True, np.diff(coord_ring) != 0])
+    codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+    codes[ring_starts] = Path.MOVETO
+    codes[np.r_[ring_starts[1:], len(coords)] - 1] = Path.CLOSEPOLY
+
+    # split coordinates into one Path per polygon part
+    coord_part = ring_part[coord_ring]
+    part_starts = np.flatnonzero(np.r_[True, np.diff(coord_part) != 0])
+    paths = [Path(c, k) for c, k in zip(np.split(coords, part_starts[1:]), np.split(codes, part_starts[1:]))]
+    return paths, part_owner[coord_part[part_starts]]
+
+
+def line_segments(geoms):
+    """
+    Converts (Multi)LineStrings into (N, 2) coordinate arrays in batch, one per line part.
+
+    Args:
+        geoms: Array-like of LineString / MultiLineString geometries
+
+    Returns:
+        Tuple of (list of coordinate arrays, array with the index of the input geometry of each array)
+    """
+    parts, part_owner = shapely.get_parts(np.asarray(geoms), return_index=True)
+    coords, coord_part = shapely.get_coordinates(parts, return_index=True)
+    part_starts = np.flatnonzero(np.r_[True, np.diff(coord_part) != 0])
+    return np.split(coords, part_starts[1:]), part_owner[coord_part[part_starts]]
+
+
 def show_shapes(list_of_shapes, epsg=None, label_attr=None, map_source=ctx.providers.OpenStreetMap.Mapnik, alpha_map=1.0):
     """
     Visualizes a list of geospatial shapes with distinct colors, optional labels, and a map background.
@@ -24,75 +71,84 @@ def show_shapes(list_of_shapes, epsg=None, label_attr=None, map_source=ctx.provi
                    - ctx.providers.Stamen.Terrain (terrain map)
         alpha_map: Transparency of the basemap (0-1, default: 1.0)
     """
-    gdfs = []
-    colors = []
+    geoms = []
+    shape_idx = []
     labels = []
+    src_crs = []
     
     if epsg is None:
         crs = "EPSG:3857"  # Web Mercator - required for contextily
     else:
         crs = f"EPSG:{epsg}"
     
-    cmap = cm.get_cmap("tab10", len(list_of_shapes))
+    # One RGBA color per input shape
+    base_colors = plt.get_cmap("tab10", len(list_of_shapes))(np.arange(len(list_of_shapes)))
     
+    # Collect raw geometries, input shape indices, labels and source CRS in flat lists (one entry per geometry)
     for i, shape in enumerate(list_of_shapes):
-        color = mcolors.to_hex(cmap(i))
-        
         if isinstance(shape, gpd.GeoDataFrame):
-            # Convert to target CRS if needed
-            shape_gdf = shape.to_crs(crs) if shape.crs != crs else shape.copy()
-            gdfs.append(shape_gdf)
-            colors.extend([color] * len(shape_gdf))
+            shape_geoms = list(shape.geometry)
+            shape_crs = shape.crs
             if label_attr and label_attr in shape.columns:
-                labels.extend(shape[label_attr].astype(str).tolist())
+                shape_labels = shape[label_attr].astype(str).tolist()
             else:
-                labels.extend([""] * len(shape_gdf))
+                shape_labels = [""] * len(shape_geoms)
                 
         elif isinstance(shape, gpd.GeoSeries):
-            gdf = gpd.GeoDataFrame(geometry=shape, crs=shape.crs if hasattr(shape, 'crs') else crs)
-            gdf = gdf.to_crs(crs) if gdf.crs != crs else gdf
-            gdfs.append(gdf)
-            colors.extend([color] * len(gdf))
-            labels.extend([""] * len(gdf))
+            shape_geoms = list(shape)
+            shape_crs = shape.crs
+            shape_labels = [""] * len(shape_geoms)
             
         elif isinstance(shape, pd.Series):  # a row
+            shape_geoms = [shape.geometry]
             shape_crs = shape.geometry.crs if hasattr(shape.geometry, 'crs') else crs
-            gdf = gpd.GeoDataFrame(geometry=[shape.geometry], crs=shape_crs)
-            gdf = gdf.to_crs(crs) if gdf.crs != crs else gdf
-            gdfs.append(gdf)
-            colors.append(color)
             if label_attr and label_attr in shape:
-                labels.append(str(shape[label_attr]))
+                shape_labels = [str(shape[label_attr])]
             else:
-                labels.append("")
+                shape_labels = [""]
                 
         elif isinstance(shape, BaseGeometry):
-            gdf = gpd.GeoDataFrame(geometry=[shape], crs=crs)
-            gdfs.append(gdf)
-            colors.append(color)
-            labels.append("")
-    
-    gdf = pd.concat(gdfs, ignore_index=True)
+            shape_geoms = [shape]
+            shape_crs = crs
+            shape_labels = [""]
+
+        else:
+            continue
+
+        geoms.extend(shape_geoms)
+        shape_idx.extend([i] * len(shape_geoms))
+        labels.extend(shape_labels)
+        src_crs.extend([shape_crs if shape_crs is not None else crs] * len(shape_geoms))
     
-    # Ensure data is in Web Mercator (EPSG:3857) for contextily
-    if gdf.crs != "EPSG:3857":
-        gdf = gdf.to_crs("EPSG:3857")
+    # Build a single GeoDataFrame in Web Mercator (EPSG:3857, required for contextily),
+    # reprojecting geometries in one batch per source CRS
+    geoms = gpd.GeoSeries(geoms)
+    src_crs = pd.Series([str(c) for c in src_crs])
+    for shape_crs, idx in src_crs.groupby(src_crs).groups.items():
+        geoms.loc[idx] = gpd.GeoSeries(geoms.loc[idx], crs=shape_crs).to_crs("EPSG:3857").values
+    gdf = gpd.GeoDataFrame({"label": labels}, geometry=geoms.values, crs="EPSG:3857")
     
-    # Separate by geometry type
-    polygons = gdf[gdf.geometry.type.isin(["Polygon", "MultiPolygon"])]
-    lines = gdf[gdf.geometry.type.isin(["LineString", "MultiLineString"])]
-    points = gdf[gdf.geometry.type.isin(["Point", "MultiPoint"])]
+    # Separate by geometry type (shapely type ids: 0/4 (Multi)Point, 1/5 (Multi)LineString, 3/6 (Multi)Polygon)
+    type_ids = shapely.get_type_id(gdf.geometry.values)
+    polygons = gdf[np.isin(type_ids, [3, 6])]
+    lines = gdf[np.isin(type_ids, [1, 5])]
+    points = gdf[np.isin(type_ids, [0, 4])]
     
     fig, ax = plt.subplots(figsize=(8, 6))
     
-    # Plot geometries
+    # Plot geometries, one collection per geometry type
+    colors = base_colors[np.asarray(shape_idx, dtype=np.intp)]
     if not polygons.empty:
-        polygons.plot(ax=ax, facecolor=[colors[i] for i in polygons.index],
-                      edgecolor="black", linewidth=1.5, alpha=0.5)
+        paths, owner = polygon_paths(polygons.geometry.values)
+        ax.add_collection(PathCollection(paths, facecolors=colors[polygons.index[owner]],
+                                         edgecolors="black", linewidths=1.5, alpha=0.5))
     if not lines.empty:
-        lines.plot(ax=ax, color=[colors[i] for i in lines.index], linewidth=2.5)
+        segments, owner = line_segments(lines.geometry.values)
+        ax.add_collection(LineCollection(segments, colors=colors[lines.index[owner]], linewidths=2.5))
     if not points.empty:
-        points.plot(ax=ax, color=[colors[i] for i in points.index], markersize=100)
+        parts, owner = shapely.get_parts(points.geometry.values, return_index=True)
+        ax.scatter(shapely.get_x(parts), shapely.get_y(parts), c=colors[points.index[owner]], s=100)
+    ax.autoscale_view()
     
     # Add basemap
     try:
@@ -103,11 +159,12 @@ def show_shapes(list_of_shapes, epsg=None, label_attr=None, map_source=ctx.provi
     
     # Add labels if available
     if label_attr:
-        for i, (geom, label) in enumerate(zip(gdf.geometry, labels)):
-            if label:
-                point = geom.representative_point()
-                ax.text(point.x, point.y, label, fontsize=8, ha='center', va='center',
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7, edgecolor='black'))
+        labels = gdf["label"].to_numpy()
+        labelled = labels != ""
+        points = shapely.point_on_surface(gdf.geometry.values[labelled])
+        for x, y, label in zip(shapely.get_x(points), shapely.get_y(points), labels[labelled]):
+            ax.text(x, y, label, fontsize=8, ha='center', va='center',
+                   bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7, edgecolor='black'))
     
     ax.set_axis_off()
     plt.axis("equal")
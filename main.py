@@ -1,7 +1,15 @@
 import argparse
+import importlib
 
-from src.partition.run_partition import run_partition
-from src.merge.run_merge import run_merge
+
+def _lazy(path):
+    """Returns a handler calling the function given as 'module:attr', importing its module only when called."""
+    module_name, attr = path.split(":")
+
+    def _call(args):
+        return getattr(importlib.import_module(module_name), attr)(args)
+
+    return _call
 
 
 def get_arguments(argv=None):
@@ -25,13 +33,13 @@ def get_arguments(argv=None):
     # Additional arguments for cut command
     cut_parser = subparsers.add_parser("cut", help="Cut geometries into smaller pieces", parents=[common_parser])
     cut_parser.add_argument("--weights_path", type=str, default=None, help="Path to the weights CSV file (default: specified config)")
-    cut_parser.set_defaults(func=run_partition)
+    cut_parser.set_defaults(func=_lazy("src.partition.run_partition:run_partition"))
     
     # Additional arguments for merge command
     merge_parser = subparsers.add_parser("merge", help="Merge geometries based on shortest route", parents=[common_parser])
     merge_parser.add_argument("--max_addresses", type=float, required=True,
                               help="Maximum number of addresses (daily average from time period specified in config) allowed in a merged polygon")
-    merge_parser.set_defaults(func=run_merge)
+    merge_parser.set_defaults(func=_lazy("src.merge.run_merge:run_merge"))
     
     return parser.parse_args(argv)
 
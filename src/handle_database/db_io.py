@@ -2,12 +2,44 @@ import sqlalchemy
 from sqlalchemy import create_engine, text
 import geopandas as gpd
 import pandas as pd
-from shapely.geometry import box
+import numpy as np
+import shapely
+from pyproj import CRS
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from src.logic_config import db_read_chunksize, db_write_chunksize
+from src.utils import get_transformer, json_parser
+
+
+@lru_cache(maxsize=None)
+def _parse_config(path: str, mtime_ns: int) -> dict:
+    '''Parses a JSON config file (cached by path and modification time).'''
+    return json_parser.loads(Path(path).read_bytes())
+
+
+def load_config(path: str) -> dict:
+    '''Loads the JSON configuration file. The file is parsed again only if it was modified since the last call.
+    Args:
+        path (str): Path to the JSON configuration file.
+    Returns:
+        dict: Parsed configuration (shared between calls, should not be modified).'''
+    resolved_path = Path(path).resolve()
+    return _parse_config(str(resolved_path), resolved_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _engine(conn_str: str) -> sqlalchemy.engine.Engine:
+    '''Creates a SQLAlchemy engine (cached by connection string, so equal configs share one connection pool).'''
+    # (pooled connections can sit idle for the whole partitioning, so they are checked before reuse)
+    return create_engine(conn_str, pool_pre_ping=True, connect_args={"application_name": "geospatial-tool"})
 
 
 def connect(connection_config: dict) -> sqlalchemy.engine.Engine:
     '''Create a SQLAlchemy engine using the provided connection configuration.
+    Engines are reused between calls with the same connection parameters (e.g. input and output in the same database).
     Args:
         connection_config (dict): Dictionary containing database connection parameters.
             Expected keys: host, port, name, user, password.
@@ -19,7 +51,92 @@ def connect(connection_config: dict) -> sqlalchemy.engine.Engine:
     db_user = connection_config["user"]
     db_pass = connection_config["password"]
     conn_str = f"postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-    return create_engine(conn_str)
+    return _engine(conn_str)
+
+
+def _select_list(geom_column: str, columns: list[str] | None) -> str:
+    """Builds the SELECT list of a query: the geometry column and the given columns, or "*" if columns is None."""
+    if columns is None:
+        return "*"
+    return ", ".join(dict.fromkeys([geom_column, *columns]))
+
+
+@lru_cache(maxsize=None)
+def _is_text_column(engine: "sqlalchemy.engine.base.Engine", table: str, column: str) -> bool:
+    '''Checks (once per engine, table and column) whether a column has a text type (text, varchar or char).'''
+    schema, _, table_name = table.rpartition(".")
+    query = text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = COALESCE(:schema, current_schema()) AND table_name = :table AND column_name = :column"
+    )
+    with engine.connect() as conn:
+        data_type = conn.execute(query, {"schema": schema or None, "table": table_name, "column": column}).scalar()
+    return data_type in ("text", "character varying", "character")
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    '''Returns the smallest alphanumeric string greater than all strings starting with prefix (None if there is none).'''
+    chars = list(prefix)
+    while chars:
+        char = chars.pop()
+        if char not in "9zZ":
+            return "".join(chars) + chr(ord(char) + 1)
+    return None
+
+
+def _prefix_filter(column: str, prefix: str, param_name: str, text_column: bool = False) -> tuple[str, dict]:
+    """
+    Builds the SQL condition (and its parameters) matching values of a column starting with the given prefix.
+    Uses a half-open range instead of LIKE, so characters such as '_' in the prefix are matched literally.
+    For a text column and an alphanumeric prefix, the range is on the column itself, so a plain btree index on it
+    serves the filter under any collation (left() rechecks the exact prefix on the rows found by the range).
+    Otherwise the column is compared as text with byte-wise ("C") ordering, which is exact for any prefix and
+    column type, but only served by an index on that expression (see ensure_indexes).
+    """
+    prefix = str(prefix)
+    if not prefix:
+        return f"{column} IS NOT NULL", {}
+    lo, hi = f"{param_name}_lo", f"{param_name}_hi"
+    if text_column and prefix.isascii() and prefix.isalnum():
+        upper = _prefix_upper_bound(prefix)
+        clauses = [f"{column} >= :{lo}"]
+        if upper is not None:
+            clauses.append(f"{column} < :{hi}")
+        clauses.append(f"left({column}, {len(prefix)}) = :{lo}")
+        params = {lo: prefix} if upper is None else {lo: prefix, hi: upper}
+        return "(" + " AND ".join(clauses) + ")", params
+
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    value = f'{column}::text COLLATE "C"'
+    return f"({value} >= :{lo} AND {value} < :{hi})", {lo: prefix, hi: upper}
+
+
+def _read_postgis_streamed(
+    query: "sqlalchemy.sql.elements.TextClause",
+    engine: "sqlalchemy.engine.base.Engine",
+    geom_col: str,
+    crs: str,
+    params: dict | None = None
+) -> "gpd.GeoDataFrame":
+    """
+    Reads a (possibly large) query result through a server-side cursor, db_read_chunksize rows at a time.
+    The WKB geometries of each chunk are parsed (in one vectorized call) as soon as it arrives, so only one chunk
+    of raw WKB is held in memory at a time. Geometries get the given crs (no spatial_ref_sys lookup).
+    """
+    chunks = []
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=db_read_chunksize) as conn:
+        for df in pd.read_sql(query, conn, params=params, chunksize=db_read_chunksize):
+            if geom_col not in df.columns:
+                raise ValueError(f"Query missing geometry column '{geom_col}'")
+            wkb = df[geom_col].to_numpy(dtype=object)
+            if len(wkb) > 0 and isinstance(wkb[0], memoryview):
+                # (bytea values come as memoryview, which shapely doesn't parse)
+                wkb = np.array([None if value is None else bytes(value) for value in wkb], dtype=object)
+            df[geom_col] = shapely.from_wkb(wkb)
+            chunks.append(gpd.GeoDataFrame(df, geometry=geom_col, crs=crs))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
 
 
 def load_area(
@@ -35,35 +152,38 @@ def load_area(
             - "area_table": Name of the table containing area data.
             - "area_id_column": Name of the column with area IDs.
             - "area_geom_column": Name of the geometry column.
+            - "crs": Coordinate reference system in the format "EPSG:XXXX".
+            - "columns" (optional): Names of other columns to load (besides the ID and geometry), all columns are loaded if missing.
         area_id (str): Prefix of the area ID to filter the areas.
     Returns:
         geopandas.GeoDataFrame: GeoDataFrame containing the loaded area geometries.
     Raises:
         ValueError: If no areas are found with the specified area ID prefix.
     """
-    from sqlalchemy import text
-
     areas_table_name = areas_cfg["area_table"]
     id_column_name = areas_cfg["area_id_column"]
+    area_geom_column_name = areas_cfg["area_geom_column"]
+    columns = areas_cfg.get("columns")
+    select_sql = _select_list(area_geom_column_name, None if columns is None else [id_column_name, *columns])
 
+    text_id = _is_text_column(engine, areas_table_name, id_column_name)
     if isinstance(area_id, list):
-        like_clauses = []
+        prefix_clauses = []
         params = {}
 
         for i, prefix in enumerate(area_id):
-            param_name = f"prefix_{i}"
-            like_clauses.append(f"{id_column_name}::text LIKE :{param_name}")
-            params[param_name] = f"{prefix}%"
+            clause, clause_params = _prefix_filter(id_column_name, prefix, f"prefix_{i}", text_id)
+            prefix_clauses.append(clause)
+            params.update(clause_params)
 
-        where_clause = " OR ".join(like_clauses)
-        query = text(f"SELECT * FROM {areas_table_name} WHERE {where_clause}")
+        where_clause = " OR ".join(prefix_clauses)
+        query = text(f"SELECT {select_sql} FROM {areas_table_name} WHERE {where_clause}")
 
     else:
-        query = text(f"SELECT * FROM {areas_table_name} WHERE {id_column_name}::text LIKE :area_id")
-        params = {"area_id": f"{area_id}%"}
+        where_clause, params = _prefix_filter(id_column_name, area_id, "area_id", text_id)
+        query = text(f"SELECT {select_sql} FROM {areas_table_name} WHERE {where_clause}")
 
-    area_geom_column_name = areas_cfg["area_geom_column"]
-    gdf = gpd.read_postgis(query, engine, geom_col=area_geom_column_name, params=params)
+    gdf = _read_postgis_streamed(query, engine, area_geom_column_name, areas_cfg["crs"], params=params)
     if area_geom_column_name != "geometry":
         gdf = gdf.rename_geometry("geometry")
     print(f"Loaded {len(gdf)} areas with ID prefix {area_id} from table {areas_table_name}.")
@@ -73,6 +193,116 @@ def load_area(
     return gdf
 
 
+_indexed_tables = set()
+
+
+def ensure_indexes(engine: "sqlalchemy.engine.base.Engine", addresses_cfg: dict):
+    """
+    Creates (if missing) the indexes used by the address filters and refreshes the table statistics.
+    Runs once per table and process.
+
+    Args:
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine connected to the spatial database.
+        addresses_cfg (dict): Addresses configuration (see load_addresses).
+    """
+    table = addresses_cfg["addresses_table"]
+    if table in _indexed_tables:
+        return
+    index_prefix = f"ix_{table.replace('.', '_')}"
+
+    statements = [
+        f"CREATE INDEX IF NOT EXISTS {index_prefix}_geom ON {table} USING GIST ({addresses_cfg['addresses_geom_column']})"
+    ]
+    teryt_column_name = addresses_cfg.get("teryt_column")
+    if teryt_column_name is not None:
+        # on what _prefix_filter compares: the column itself if it is text, otherwise its byte-wise text form
+        if _is_text_column(engine, table, teryt_column_name):
+            teryt_index = teryt_column_name
+        else:
+            teryt_index = f'({teryt_column_name}::text COLLATE "C")'
+        statements.append(f"CREATE INDEX IF NOT EXISTS {index_prefix}_teryt ON {table} ({teryt_index})")
+    time_column_name = (addresses_cfg.get("time_period") or {}).get("column_name")
+    if time_column_name is not None:
+        statements.append(f"CREATE INDEX IF NOT EXISTS {index_prefix}_date ON {table} ({time_column_name})")
+    statements.append(f"ANALYZE {table}")
+
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    _indexed_tables.add(table)
+    print(f"Ensured indexes on table {table}.")
+
+
+def _teryt_filter(engine: "sqlalchemy.engine.base.Engine", addresses_cfg: dict, teryt_id: str) -> tuple[str, dict]:
+    """Builds the SQL condition (and its parameters) filtering addresses by TERYT ID prefix."""
+    teryt_column_name = addresses_cfg.get("teryt_column")
+    if teryt_column_name is None:
+        raise ValueError("TERYT ID provided but 'teryt_column' not specified in addresses configuration.")
+    print(f"Filtering addresses by TERYT ID: {teryt_id} using column '{teryt_column_name}'")
+    text_column = _is_text_column(engine, addresses_cfg["addresses_table"], teryt_column_name)
+    return _prefix_filter(teryt_column_name, teryt_id, "area_id", text_column)
+
+
+def _bbox_filter(geom_column: str, crs: str, bbox: tuple[float, float, float, float]) -> tuple[str, dict]:
+    """
+    Builds the SQL condition (and its parameters) selecting geometries intersecting a bounding box (minx, miny, maxx, maxy).
+    The explicit && (bounding box overlap, served by the GIST index) comes first, so the exact
+    ST_Intersects test only runs on its candidates. Only identifiers are formatted into the SQL,
+    so the statement text is the same for every bbox and CRS.
+    """
+    envelope = "ST_MakeEnvelope(:minx, :miny, :maxx, :maxy, :srid)"
+    return (
+        f"{geom_column} && {envelope} AND ST_Intersects({geom_column}, {envelope})",
+        {"minx": bbox[0], "miny": bbox[1], "maxx": bbox[2], "maxy": bbox[3], "srid": int(crs.split(":")[1])}
+    )
+
+
+def _addresses_filters(
+    addresses_cfg: dict,
+    bbox: tuple[float, float, float, float] | None
+) -> tuple[list[str], dict]:
+    """Builds the SQL conditions (and their parameters) filtering addresses by bounding box and time period."""
+    where_clauses = []
+    params = {}
+
+    # Filter by bounding box if provided (first, so the planner uses the spatial index)
+    if bbox is not None:
+        bbox_clause, bbox_params = _bbox_filter(addresses_cfg["addresses_geom_column"], addresses_cfg["crs"], bbox)
+        where_clauses.append(bbox_clause)
+        params.update(bbox_params)
+
+    # Filter by time period if provided
+    time_period_cfg = addresses_cfg.get("time_period")
+    if time_period_cfg is not None:
+        time_column_name = time_period_cfg.get("column_name")
+        start = time_period_cfg.get("start")
+        end = time_period_cfg.get("end")
+        if time_column_name is None or start is None or end is None:
+            print("Time period configuration is incomplete, skipping time filtering.")
+        else:
+            print(f"Filtering addresses by time period: {start} to {end} using column '{time_column_name}'")
+            where_clauses.append(f"{time_column_name} BETWEEN :start_date AND :end_date")
+            params["start_date"] = start
+            params["end_date"] = end
+
+    return where_clauses, params
+
+
+def _addresses_criteria(
+    addresses_cfg: dict,
+    teryt_id: str | None,
+    params: dict,
+    bbox: tuple[float, float, float, float] | None
+) -> str:
+    """Describes the criteria used to load addresses (for printing)."""
+    time_period_cfg = addresses_cfg.get("time_period")
+    return (
+        f"{'\nteryt_id = ' + str(teryt_id) if teryt_id is not None else ''}"
+        f"{'\ntime_period = ' + str(time_period_cfg['start']) + ' to ' + str(time_period_cfg['end']) if 'start_date' in params else ''} "
+        f"{'\nbbox = ' + str(bbox) if bbox is not None else ''}"
+    )
+
+
 def load_addresses(
     engine: "sqlalchemy.engine.base.Engine",
     addresses_cfg: dict,
@@ -89,6 +319,8 @@ def load_addresses(
             - "crs" (str): Coordinate reference system in the format "EPSG:XXXX".
             - "teryt_column" (str, optional): Name of the TERYT column.
             - "date_column" (str, optional): Name of the date column for filtering by time period.
+            - "columns" (list[str], optional): Names of other columns to load (besides geometry), all columns are loaded if missing.
+            - "create_indexes" (bool, optional): Whether load_all_data_with_bbox should create the supporting indexes (see ensure_indexes).
         teryt_id (str, optional): TERYT area identifier to filter addresses by administrative area. Defaults to None.
         bbox (tuple[float, float, float, float], optional): Bounding box (minx, miny, maxx, maxy) to spatially filter addresses. Defaults to None.
     Returns:
@@ -99,70 +331,90 @@ def load_addresses(
     addresses_table_name = addresses_cfg["addresses_table"]
     addresses_geom_column_name = addresses_cfg["addresses_geom_column"]
 
-    where_clauses = []
-    params = {}
-
-    filtered_by_teryt_id = False
-    filtered_by_time_period = False
-    filtered_by_bbox = False
+    where_clauses, params = _addresses_filters(addresses_cfg, bbox)
 
     # Filter by TERYT_ID if provided
     if teryt_id is not None:
-        teryt_column_name = addresses_cfg.get("teryt_column")
-        if teryt_column_name is None:
-            raise ValueError("TERYT ID provided but 'teryt_column' not specified in addresses configuration.")
-        else:
-            print(f"Filtering addresses by TERYT ID: {teryt_id} using column '{teryt_column_name}'")
-            where_clauses.append(f"{teryt_column_name}::text LIKE :area_id")
-            params["area_id"] = f"{teryt_id}%"
-            filtered_by_teryt_id = True
-
-    # Filter by time period if provided
-    time_period_cfg = addresses_cfg.get("time_period")
-    if time_period_cfg is not None:
-        time_column_name = time_period_cfg.get("column_name")
-        start = time_period_cfg.get("start")
-        end = time_period_cfg.get("end")
-        if time_column_name is None or start is None or end is None:
-            print("Time period configuration is incomplete, skipping time filtering.")
-        else:
-            print(f"Filtering addresses by time period: {start} to {end} using column '{time_column_name}'")
-            where_clauses.append(f"{time_column_name} BETWEEN :start_date AND :end_date")
-            params["start_date"] = start
-            params["end_date"] = end
-            filtered_by_time_period = True
-
-    # Filter by bounding box if provided
-    if bbox is not None:
-        # bbox: (minx, miny, maxx, maxy)
-        epsg_num = addresses_cfg.get("crs").split(":")[1]
-        where_clauses.append(
-            f"ST_Intersects({addresses_geom_column_name}, ST_MakeEnvelope(:minx, :miny, :maxx, :maxy, {epsg_num}))"
-        )
-        params.update({"minx": bbox[0], "miny": bbox[1], "maxx": bbox[2], "maxy": bbox[3]})
-        filtered_by_bbox = True
+        teryt_clause, teryt_params = _teryt_filter(engine, addresses_cfg, teryt_id)
+        where_clauses.append(teryt_clause)
+        params.update(teryt_params)
 
     where_sql = ""
     if where_clauses:
         where_sql = " WHERE " + " AND ".join(where_clauses)
 
-    query = text(f"SELECT * FROM {addresses_table_name}{where_sql}")
-    gdf = gpd.read_postgis(query, engine, geom_col=addresses_geom_column_name, params=params)
+    select_sql = _select_list(addresses_geom_column_name, addresses_cfg.get("columns"))
+    query = text(f"SELECT {select_sql} FROM {addresses_table_name}{where_sql}")
+    gdf = _read_postgis_streamed(query, engine, addresses_geom_column_name, addresses_cfg["crs"], params=params)
     
     if addresses_geom_column_name != "geometry":
         gdf = gdf.rename_geometry("geometry")
 
-    print(
-        f"Loaded {len(gdf)} addresses from table {addresses_table_name} with criteria:"
-        f"{'\nteryt_id = ' + str(teryt_id) if filtered_by_teryt_id else ''}"
-        f"{'\ntime_period = ' + str(time_period_cfg['start']) + ' to ' + str(time_period_cfg['end']) if filtered_by_time_period else ''} "
-        f"{'\nbbox = ' + str(bbox) if filtered_by_bbox else ''}"
+    criteria = _addresses_criteria(addresses_cfg, teryt_id, params, bbox)
+    print(f"Loaded {len(gdf)} addresses from table {addresses_table_name} with criteria:{criteria}")
+    if gdf.empty:
+        raise ValueError(f"No addresses found in table {addresses_table_name} with the given criteria: {criteria}.")
+    return gdf
+
+
+def load_addresses_with_fallback(
+    engine: "sqlalchemy.engine.base.Engine",
+    addresses_cfg: dict,
+    teryt_id: str | None,
+    bbox: tuple[float, float, float, float]
+) -> "gpd.GeoDataFrame":
+    """
+    Loads addresses inside a bounding box filtered by TERYT ID, falling back to all addresses in the bounding box
+    if none match the TERYT ID. Both cases are resolved by a single query.
+    Args:
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine connected to the spatial database.
+        addresses_cfg (dict): Addresses configuration dictionary (see load_addresses).
+        teryt_id (str | None): TERYT area identifier to filter addresses by. If None, only the bbox filter is used.
+        bbox (tuple[float, float, float, float]): Bounding box (minx, miny, maxx, maxy) in the crs of the addresses.
+    Returns:
+        geopandas.GeoDataFrame: GeoDataFrame containing the loaded addresses with geometry column renamed to "geometry".
+    Raises:
+        ValueError: If no addresses are found in the bounding box.
+    """
+    if teryt_id is None:
+        return load_addresses(engine, addresses_cfg, bbox=bbox)
+
+    addresses_table_name = addresses_cfg["addresses_table"]
+    addresses_geom_column_name = addresses_cfg["addresses_geom_column"]
+
+    where_clauses, params = _addresses_filters(addresses_cfg, bbox)
+    teryt_clause, teryt_params = _teryt_filter(engine, addresses_cfg, teryt_id)
+    params.update(teryt_params)
+
+    # (the TERYT column is needed by the candidates to filter them, even if it's not a selected column)
+    columns = addresses_cfg.get("columns")
+    select_sql = _select_list(addresses_geom_column_name, columns)
+    candidates_sql = _select_list(
+        addresses_geom_column_name, None if columns is None else [*columns, addresses_cfg["teryt_column"]]
+    )
+
+    # candidates are scanned once (the CTE is referenced twice, so it is materialized),
+    # rows outside the TERYT ID are returned only if none match it
+    query = text(
+        f"WITH candidates AS (SELECT {candidates_sql} FROM {addresses_table_name} WHERE {' AND '.join(where_clauses)}), "
+        f"teryt_matches AS (SELECT {select_sql} FROM candidates WHERE {teryt_clause}) "
+        f"SELECT *, TRUE AS _teryt_match FROM teryt_matches "
+        f"UNION ALL "
+        f"SELECT {select_sql}, FALSE AS _teryt_match FROM candidates WHERE NOT EXISTS (SELECT 1 FROM teryt_matches)"
     )
+    gdf = _read_postgis_streamed(query, engine, addresses_geom_column_name, addresses_cfg["crs"], params=params)
+
+    if addresses_geom_column_name != "geometry":
+        gdf = gdf.rename_geometry("geometry")
+
+    teryt_matched = bool(gdf.pop("_teryt_match").all())
+    if not teryt_matched and not gdf.empty:
+        print(f"No addresses found for TERYT ID {teryt_id} in bbox {bbox}, loaded all addresses in bbox.")
+
+    criteria = _addresses_criteria(addresses_cfg, teryt_id if teryt_matched else None, params, bbox)
+    print(f"Loaded {len(gdf)} addresses from table {addresses_table_name} with criteria:{criteria}")
     if gdf.empty:
-        raise ValueError(f"No addresses found in table {addresses_table_name} with the given criteria: "
-                 f"{'\nteryt_id = ' + str(teryt_id) if filtered_by_teryt_id else ''} "
-                 f"{'\ntime_period = ' + str(time_period_cfg['start']) + ' to ' + str(time_period_cfg['end']) if filtered_by_time_period else ''} "
-                 f"{'\nbbox = ' + str(bbox) if filtered_by_bbox else ''}.")
+        raise ValueError(f"No addresses found in table {addresses_table_name} with the given criteria: {criteria}.")
     return gdf
 
 
@@ -187,9 +439,21 @@ def get_num_days_from_time_period(addresses_cfg: dict) -> int:
         raise ValueError("Can't calculate average daily number of addresses. Time period not specified or incomplete in addresses configuration.")
 
 
+@lru_cache(maxsize=8)
+def _read_weights_csv(path: str, mtime_ns: int) -> "pd.DataFrame":
+    '''Reads and validates a weights CSV file (cached by path and modification time).'''
+    # keys/values are matched against text columns from PostGIS, so never let pandas infer numbers
+    weights_table = pd.read_csv(path, dtype={"osm_key": str, "osm_value": str, "weight": "float64"})
+    for colname in ["osm_key", "osm_value", "weight"]:
+        if colname not in weights_table.columns:
+            raise ValueError(f"Column '{colname}' not found in weights CSV file.")
+    return weights_table
+
+
 def load_weights_from_csv(path: str | None, weights_config: dict) -> "pd.DataFrame":
     """
     Loads a weights table from a CSV file and validates required columns.
+    The file is read again only if it was modified since the last call.
 
     Args:
         path (str): The file path to the CSV file containing the weights table.
@@ -203,10 +467,9 @@ def load_weights_from_csv(path: str | None, weights_config: dict) -> "pd.DataFra
 
     if path is None:
         path = weights_config["default_weights_path"]
-    weights_table = pd.read_csv(path)
-    for colname in ["osm_key", "osm_value", "weight"]:
-        if colname not in weights_table.columns:
-            raise ValueError(f"Column '{colname}' not found in weights CSV file.")
+    resolved_path = Path(path).resolve()
+    # a copy, so callers can't modify the cached table
+    weights_table = _read_weights_csv(str(resolved_path), resolved_path.stat().st_mtime_ns).copy()
     print(f"Loaded weights from {path}.")
     return weights_table
 
@@ -214,7 +477,8 @@ def load_weights_from_csv(path: str | None, weights_config: dict) -> "pd.DataFra
 def load_osm_data(
         engine: "sqlalchemy.engine.base.Engine",
         osm_data_cfg: dict,
-        bbox: tuple[float, float, float, float] | None = None
+        bbox: tuple[float, float, float, float] | None = None,
+        osm_keys: list[str] | None = None
     ) -> "gpd.GeoDataFrame":
     """
     Loads OpenStreetMap (OSM) data from a database table into a GeoDataFrame, optionally filtering by a bounding box.
@@ -225,8 +489,11 @@ def load_osm_data(
             - 'table' (str): Name of the OSM data table.
             - 'geom_column' (str): Name of the geometry column.
             - 'crs' (str): Coordinate reference system in the format 'EPSG:XXXX'.
+            - 'columns' (list[str], optional): Names of other columns to load (besides geometry), all columns are loaded if missing.
         bbox (tuple[float, float, float, float] | None, optional): Bounding box to filter the data,
             specified as (minx, miny, maxx, maxy). If None, no spatial filter is applied.
+        osm_keys (list[str] | None, optional): OSM keys (columns) used for weighting streets. If provided,
+            they are loaded (in addition to 'columns'), and only rows with at least one of them not null. If None, no rows are filtered out.
 
     Returns:
         geopandas.GeoDataFrame: GeoDataFrame containing the loaded OSM data.
@@ -234,16 +501,24 @@ def load_osm_data(
     Raises:
         ValueError: If no data is found in the specified table (and bounding box, if provided).
     """
-    query = f"SELECT * FROM {osm_data_cfg['table']}"
+    geom_col = osm_data_cfg["geom_column"]
+    conditions = []
+    params = {}
     if bbox is not None:
-        # bbox: (minx, miny, maxx, maxy)
-        epsg_num = osm_data_cfg.get("crs").split(":")[1]
-        geom_col = osm_data_cfg["geom_column"]
-        bbox_sql = (
-            f"ST_Intersects({geom_col}, ST_MakeEnvelope({bbox[0]}, {bbox[1]}, {bbox[2]}, {bbox[3]}, {epsg_num}))"
-        )
-        query += f" WHERE {bbox_sql}"
-    gdf = gpd.read_postgis(query, engine, geom_col=osm_data_cfg["geom_column"])
+        bbox_clause, params = _bbox_filter(geom_col, osm_data_cfg["crs"], bbox)
+        conditions.append(bbox_clause)
+    columns = osm_data_cfg.get("columns")
+    if osm_keys is not None:
+        # rows without any weighted tag are not relevant for partitioning, so they are filtered out in the database
+        columns = list(columns or [])
+        # keys already among the configured columns (quoted or not) are not selected twice
+        selected = {column.strip('"') for column in [geom_col, *columns]}
+        columns += [f'"{key}"' for key in osm_keys if key not in selected]
+        conditions.append("(" + " OR ".join(f'"{key}" IS NOT NULL' for key in osm_keys) + ")")
+    query = f"SELECT {_select_list(geom_col, columns)} FROM {osm_data_cfg['table']}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    gdf = _read_postgis_streamed(text(query), engine, geom_col, osm_data_cfg["crs"], params=params)
     if gdf.empty:
         raise ValueError(f"\nNo OSM data found in table {osm_data_cfg['table']}.")
     print(f"Loaded OSM data ({len(gdf)} rows) from table {osm_data_cfg['table']}."
@@ -255,41 +530,53 @@ def load_osm_data(
     return gdf
 
 
-def load_all_data_with_bbox(engine, config, args):
-    '''Loads all relevant data from the database within a specified bounding box.'''
+def _reproject_bbox(bbox: tuple[float, float, float, float], crs_from: str, crs_to: str) -> tuple[float, float, float, float]:
+    '''Reproject bounding box coordinates from one CRS to another (densified edges, directly in PROJ).'''
+    transformer = get_transformer(crs_from, crs_to)
+    if transformer is None:
+        return bbox
+    return transformer.transform_bounds(*bbox, densify_pts=21)
+
+
+def load_all_data_with_bbox(engine, config, args, osm_keys=None):
+    '''Loads all relevant data from the database within a specified bounding box.
+    OSM data is narrowed to the given osm_keys (see load_osm_data) if they are provided.'''
 
     print("\nLoading areas...")
     # Load data from database
     area  = load_area(engine, config["areas"], args.area_id)
-    # Get bounding box of the union of area geometries
-    bbox = area.union_all().bounds  # (minx, miny, maxx, maxy)
+    # Get bounding box of all area geometries (equal to the bounds of their union, without computing it)
+    bbox = tuple(area.total_bounds.tolist())  # (minx, miny, maxx, maxy)
     from_crs = config["areas"]["crs"]
     print(f"Bounding box of area: {bbox}")
 
-    def reproject_bbox(bbox, crs_from, crs_to):
-        """Reproject bounding box coordinates from one CRS to another."""
-        bbox_gdf = gpd.GeoDataFrame(geometry=[box(*bbox)], crs=crs_from)
-        bbox_gdf = bbox_gdf.to_crs(crs_to)
-        return bbox_gdf.geometry[0].bounds
-    
     # Load addresses using bbox and teryt_id if provided
     print("\nLoading adresses...")
+    if config["addresses"].get("create_indexes"):
+        ensure_indexes(engine, config["addresses"])
 
-    bbox_reprojected = reproject_bbox(bbox, from_crs, config["addresses"]["crs"])
+    bbox_reprojected = _reproject_bbox(bbox, from_crs, config["addresses"]["crs"])
     teryt_id = args.teryt_id if args.teryt_id else None
 
-    addresses = load_addresses(engine, config["addresses"], teryt_id=teryt_id, bbox=bbox_reprojected)
-    if addresses.empty:
-        print(f"No addresses found for TERYT ID {teryt_id} in bbox {bbox}, loading all addresses in bbox.")
-        addresses = load_addresses(engine, config["addresses"], bbox=bbox)
-
     if config.get("osm_data") is None:
+        addresses = load_addresses_with_fallback(engine, config["addresses"], teryt_id=teryt_id, bbox=bbox_reprojected)
         return {"area": area, "addresses": addresses}
 
-    # Load OSM data using bounding box
+    # Load OSM data using bounding box, concurrently with the addresses (each query uses its own pooled connection)
     print("\nLoading OpenStreetMap data...")
-    bbox_reprojected = reproject_bbox(bbox, from_crs, config["osm_data"]["crs"])
-    osm_data = load_osm_data(engine, config["osm_data"], bbox=bbox_reprojected)
+    if config["osm_data"]["crs"] == config["addresses"]["crs"]:
+        osm_bbox_reprojected = bbox_reprojected
+    else:
+        osm_bbox_reprojected = _reproject_bbox(bbox, from_crs, config["osm_data"]["crs"])
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        addresses_future = executor.submit(
+            load_addresses_with_fallback, engine, config["addresses"], teryt_id=teryt_id, bbox=bbox_reprojected
+        )
+        osm_future = executor.submit(
+            load_osm_data, engine, config["osm_data"], bbox=osm_bbox_reprojected, osm_keys=osm_keys
+        )
+        addresses = addresses_future.result()
+        osm_data = osm_future.result()
 
     return {"area": area, "addresses": addresses, "osm_data": osm_data}
 
@@ -302,7 +589,7 @@ def save_result(
         if_exists: str = "replace"
     ):
     """
-    Saves a GeoDataFrame to a PostGIS table after reprojecting it to the specified CRS.
+    Saves a GeoDataFrame to a PostGIS table, reprojected to the specified CRS (by PostGIS, if it differs from the CRS of the data).
     
     Args:
         engine (sqlalchemy.engine.Engine): SQLAlchemy engine connected to the target database.
@@ -318,6 +605,46 @@ def save_result(
     """
     if output_table is None:
         output_table = output_cfg["table"]
-    gdf = gdf.to_crs(output_cfg["crs"])
-    gdf.to_postgis(output_table, engine, if_exists=if_exists)
+    # a schema-qualified name ("schema.table") is passed to to_postgis as schema and table name
+    schema, _, table_name = output_table.rpartition(".")
+    schema = schema or None
+    target_epsg = CRS.from_user_input(output_cfg["crs"]).to_epsg()
+    if target_epsg is None or gdf.crs is None or gdf.crs == output_cfg["crs"]:
+        # (reprojected in Python only if PostGIS can't do it, for a target CRS without an EPSG code)
+        if gdf.crs != output_cfg["crs"]:
+            gdf = gdf.to_crs(output_cfg["crs"])
+        gdf.to_postgis(table_name, engine, schema=schema, if_exists=if_exists, chunksize=db_write_chunksize)
+        print(f"Saved {len(gdf)} records to table {output_table} (mode: {if_exists}).")
+        return
+
+    # The geometries are reprojected by PostGIS: the data is written in its own CRS to a staging table,
+    # from which the output table is created (or appended to) with ST_Transform, then the staging table is dropped
+    table_exists = sqlalchemy.inspect(engine).has_table(table_name, schema=schema)
+    if table_exists and if_exists == "fail":
+        raise ValueError(f"Table '{output_table}' already exists.")
+    # (names quoted the way to_postgis creates them, e.g. for mixed-case tables)
+    quote = engine.dialect.identifier_preparer.quote
+    schema_prefix = f"{quote(schema)}." if schema else ""
+    target_table = schema_prefix + quote(table_name)
+    stage_table = schema_prefix + quote(f"{table_name}_stage")
+    geom_col = gdf.geometry.name
+    columns = ", ".join(quote(col) for col in gdf.columns)
+    values = ", ".join(
+        f"ST_Transform({quote(col)}, {target_epsg})::geometry(Geometry, {target_epsg}) AS {quote(col)}" if col == geom_col
+        else quote(col) for col in gdf.columns
+    )
+    try:
+        gdf.to_postgis(f"{table_name}_stage", engine, schema=schema, if_exists="replace", chunksize=db_write_chunksize)
+        with engine.begin() as conn:
+            if table_exists and if_exists == "append":
+                conn.execute(text(f"INSERT INTO {target_table} ({columns}) SELECT {values} FROM {stage_table}"))
+            else:
+                conn.execute(text(f"DROP TABLE IF EXISTS {target_table}"))
+                conn.execute(text(f"CREATE TABLE {target_table} AS SELECT {values} FROM {stage_table}"))
+                # (unnamed, so PostgreSQL picks a name not used by any other index)
+                conn.execute(text(f"CREATE INDEX ON {target_table} USING GIST ({quote(geom_col)})"))
+    finally:
+        # (also when the output table couldn't be written, so no staging table is left behind)
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {stage_table}"))
     print(f"Saved {len(gdf)} records to table {output_table} (mode: {if_exists}).")
\ No newline at end of file
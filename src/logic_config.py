@@ -9,9 +9,21 @@ streets_extension_distance = 20  # distance to extend streets for intersection d
 close_points_treshold = 50  # distance in meters to consider points close enough to be merged
 max_number_of_intersections = 25  # maximum number of intersections to process (select top by weight if exceeded)
 
+# OSRM request parameters
+osrm_max_workers = 32  # number of concurrent requests sent to the OSRM server (also the connection pool size)
+osrm_memory_cache_size = 8192  # number of OSRM responses kept in memory (least recently used are dropped first)
+osrm_url = "http://localhost:5000"  # address of the OSRM server
+osrm_profile = "driving"  # OSRM profile used in request URLs
+osrm_cache_path = None  # file caching OSRM route responses between runs (e.g. ".osrm_cache.sqlite"), off by default; keyed by server and profile, delete it after changing the OSRM data
+
+# database parameters
+db_read_chunksize = 50000  # rows fetched at a time when streaming addresses and OSM data from the database
+db_write_chunksize = 10000  # rows sent per COPY batch when saving results
+
 # partitioning parameters
 number_of_alternatives = 3  # number of alternative routes to request from OSRM for partitioning
 default_top_weights_percentage = 0.2  # percentage of top weights to consider for partitioning
+split_max_workers = 4  # number of threads splitting a polygon along the candidate cuts (1 to split sequentially)
 
 # cleaning polygons parameters
 min_artifact_width = 30  # buffer in meters for cleaning polygons
\ No newline at end of file
@@ -3,7 +3,7 @@ import geopandas as gpd
 import pandas as pd
 import sys
 
-from src.utils import shared_border, addresses_inside_polygon, get_osrm_route, sort_polygons_spatially
+from src.utils import shared_border, addresses_inside_polygon, get_osrm_durations, sort_polygons_spatially
 from src.logic_config import metrical_crs
 
 
@@ -61,6 +61,27 @@ def merge_polygons_by_shortest_route(gdf, addresses, min_addresses, max_addresse
         else:
             return calculate_points_centroid(gpd.GeoDataFrame(geometry=[poly], crs=gdf_new.crs))
 
+    # helper function to calculate route durations between addresses centroids
+    def route_durations(row, neighbors):
+        """
+        Calculate durations of routes from the addresses centroid of a row to those of its neighbors
+        (with a single OSRM table request).
+
+        Args:
+            row (pd.Series): Row of the polygon to merge.
+            neighbors (gpd.GeoDataFrame): Neighbors of the polygon.
+
+        Returns:
+            list[float]: Route duration to each neighbor.
+        """
+        durations = get_osrm_durations(
+            row.addresses_centroid.x, row.addresses_centroid.y,
+            [(pt.x, pt.y) for pt in neighbors.addresses_centroid]
+        )
+        if durations is None:
+            raise RuntimeError("OSRM table request failed, check if the OSRM server is running.")
+        return durations
+
 
     # Validate input parameters
     if n_days is not None:
@@ -132,9 +153,7 @@ def merge_polygons_by_shortest_route(gdf, addresses, min_addresses, max_addresse
             continue
 
         # Find the neighbor with the shortest route to polygon_to_merge (based on centroid)
-        neighbors_to_merge["route_duration"] = neighbors_to_merge.addresses_centroid.apply(
-            lambda pt: get_osrm_route(row_to_merge.addresses_centroid.x, row_to_merge.addresses_centroid.y, pt.x, pt.y).duration
-        )
+        neighbors_to_merge["route_duration"] = route_durations(row_to_merge, neighbors_to_merge)
 
         best_neighbor = neighbors_to_merge.loc[neighbors_to_merge["route_duration"].idxmin()]
         row_merged_geom = gdf_new.loc[[row_to_merge.name, best_neighbor.name]].union_all()
@@ -173,9 +192,7 @@ def merge_polygons_by_shortest_route(gdf, addresses, min_addresses, max_addresse
                 continue
             
             # Find the neighbor with the shortest route to polygon_to_merge (based on centroid)
-            neighbors_to_merge["route_duration"] = neighbors_to_merge.addresses_centroid.apply(
-                lambda pt: get_osrm_route(row.addresses_centroid.x, row.addresses_centroid.y, pt.x, pt.y).duration
-            )
+            neighbors_to_merge["route_duration"] = route_durations(row, neighbors_to_merge)
 
             best_neighbor = neighbors_to_merge.loc[neighbors_to_merge["route_duration"].idxmin()]
             row_merged_geom = gdf_new.loc[[row.name, best_neighbor.name]].union_all()
@@ -1,18 +1,11 @@
-from pathlib import Path
-import json
 import src.handle_database.db_io as db_io
 from src.merge.merge_logic import merge_polygons_by_shortest_route
-import src.handle_database.db_io as db_io
-
-import logging
-logging.basicConfig(level=logging.INFO)
 
 def run_merge(args):
     '''Main function to execute the merging process.'''
 
     # Load configuration
-    with open(Path(args.config).resolve()) as f:
-        config = json.load(f)
+    config = db_io.load_config(args.config)
     
     # Connect to database
     engine_input = db_io.connect(config["input_db"])
@@ -1,6 +1,10 @@
 import geopandas as gpd
 import pandas as pd
+import numpy as np
+import shapely
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from shapely.geometry import Polygon, GeometryCollection
 from shapely.ops import linemerge, split
 
@@ -12,16 +16,17 @@ import src.logic_config as cfg
 metrical_crs = cfg.metrical_crs
 
 
-def find_all_routes(points: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+def find_all_routes(points: gpd.GeoDataFrame, crs: str = "EPSG:4326") -> gpd.GeoDataFrame:
     """
     Computes OSRM routes between all unique pairs of points in the input GeoDataFrame.
 
     Args:
         points (gpd.GeoDataFrame): GeoDataFrame containing Point geometries. Must have at least 2 entries.
+        crs (str): CRS of the returned routes (route coordinates are reprojected directly from the OSRM lon/lat).
 
     Returns:
         gpd.GeoDataFrame: GeoDataFrame containing LineString geometries for each route between point pairs,
-                          with all routes concatenated and index reset.
+                          with indices of the pair's points ('from', 'to'), route duration and weight.
 
     Raises:
         Exception: If the input GeoDataFrame contains fewer than 2 points.
@@ -29,25 +34,43 @@ def find_all_routes(points: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     if len(points) < 2:
         raise Exception("GeoDataFrame 'points' must contain at least 2 entries")
 
-    points_wgs84 = points.to_crs("EPSG:4326")
-    routes: list[gpd.GeoDataFrame] = []
-
-    for i in range(len(points_wgs84)):
-        for j in range(i + 1, len(points_wgs84)):
-            p1 = points_wgs84.iloc[i]
-            p2 = points_wgs84.iloc[j]
-            p1_lon, p1_lat = p1.geometry.x, p1.geometry.y
-            p2_lon, p2_lat = p2.geometry.x, p2.geometry.y
-
-            route_gdf = utils.get_osrm_route(p1_lon, p1_lat, p2_lon, p2_lat, alternatives=cfg.number_of_alternatives)
-            if route_gdf is not None:
-                routes.append(route_gdf)
-
-    if routes:
-        routes_gdf = pd.concat(routes).reset_index(drop=True)
-        return routes_gdf
-    else:
-        return gpd.GeoDataFrame(columns=["geometry", "duration", "weight"], crs="EPSG:4326")
+    points_coords = shapely.get_coordinates(points.geometry.values)
+    coords = utils.transform_coords(points_coords, points.crs, "EPSG:4326").tolist()
+
+    first, second = np.triu_indices(len(coords), k=1)
+    pairs = list(zip(first.tolist(), second.tolist()))
+
+    def routes_for_pair(pair: tuple[int, int]) -> list[tuple] | None:
+        (p1_lon, p1_lat), (p2_lon, p2_lat) = coords[pair[0]], coords[pair[1]]
+        return utils.request_osrm_routes(p1_lon, p1_lat, p2_lon, p2_lat, alternatives=cfg.number_of_alternatives)
+
+    # requests are network-bound, so they are sent concurrently through the shared session
+    # (executor.map keeps the results in the order of pairs)
+    with ThreadPoolExecutor(max_workers=cfg.osrm_max_workers) as executor:
+        results = list(executor.map(routes_for_pair, pairs))
+
+    # build the result column-wise, in a single GeoDataFrame construction
+    n_routes = sum(len(pair_routes) for pair_routes in results if pair_routes is not None)
+    from_idx = np.empty(n_routes, dtype=np.int32)
+    to_idx = np.empty(n_routes, dtype=np.int32)
+    route_coords = []
+    durations = np.empty(n_routes, dtype=np.float64)
+    weights = np.empty(n_routes, dtype=np.float64)
+    k = 0
+    for (i, j), pair_routes in zip(pairs, results):
+        for coords_lonlat, duration, weight in pair_routes or []:
+            from_idx[k], to_idx[k] = i, j
+            route_coords.append(coords_lonlat)
+            durations[k], weights[k] = duration, weight
+            k += 1
+
+    geometry = utils.linestrings_from_coords(route_coords)
+    geometry = shapely.transform(geometry, lambda xy: utils.transform_coords(xy, "EPSG:4326", crs))
+    return gpd.GeoDataFrame(
+        {"from": from_idx, "to": to_idx, "duration": durations, "weight": weights},
+        geometry=geometry,
+        crs=crs
+    )
     
 
 
@@ -107,20 +130,21 @@ def join_gdfs_longest_border(gdf1, gdf2):
         geopandas.GeoDataFrame: A new GeoDataFrame containing merged polygons.
     """
 
-    merged_gdf = gdf1[["geometry"]].copy()
+    merged_geoms = list(gdf1.geometry.values)
     leftover = []
 
-    for idx2, row2 in gdf2.iterrows():
-        neighbors_from_merged = merged_gdf[merged_gdf.apply(lambda x: utils.shared_border(x.geometry, row2.geometry) is not None, axis=1)].copy()
-        if neighbors_from_merged.empty:
-            warnings.warn(f"No shared border found for polygon {row2.name} in gdf2, will not merge.")
+    for idx2, geom2 in zip(gdf2.index, gdf2.geometry.values):
+        borders = [utils.shared_border(geom, geom2) for geom in merged_geoms]
+        if all(border is None for border in borders):
+            warnings.warn(f"No shared border found for polygon {idx2} in gdf2, will not merge.")
             leftover.append(idx2)
             continue
-        neighbors_from_merged["border_length"] = neighbors_from_merged.apply(lambda x: utils.shared_border(x.geometry, row2.geometry).length, axis=1)
+        border_lengths = [border.length if border is not None else -1.0 for border in borders]
 
-        best_neighbor = neighbors_from_merged.loc[neighbors_from_merged["border_length"].idxmax()]
-        merged_row = best_neighbor.geometry.union(row2.geometry)
-        merged_gdf.loc[merged_gdf.index == best_neighbor.name, "geometry"] = [merged_row]
+        best_neighbor = int(np.argmax(border_lengths))
+        merged_geoms[best_neighbor] = merged_geoms[best_neighbor].union(geom2)
+
+    merged_gdf = gpd.GeoDataFrame(geometry=merged_geoms, index=gdf1.index, crs=gdf1.crs)
 
     if leftover:
         warnings.warn(f"Polygons {leftover} in gdf2 were not merged due to no shared border with gdf1.")
@@ -136,10 +160,14 @@ def cut_single_polygon(
     weights: pd.DataFrame,
     top_weights_percentage: float = cfg.default_top_weights_percentage,
     depth: int = 0,
-    _iteration_counter: list[int] = None
+    _iteration_counter: list[int] = None,
+    street_weights: np.ndarray | None = None
 ) -> list[gpd.GeoDataFrame]:
     """
-    Recursively splits a polygon using street routes to maximize balance and weight.
+    Repeatedly splits a polygon using street routes to maximize balance and weight.
+
+    The pieces to cut are kept on a stack (instead of recursive calls), pieces are returned
+    in the same order as a depth-first recursion would return them.
 
     Args:
         polygon_gdf (gpd.GeoDataFrame): GeoDataFrame with a single polygon geometry.
@@ -148,8 +176,10 @@ def cut_single_polygon(
         min_addresses (int): Minimum number of addresses required in each resulting part.
         weights (pd.DataFrame): DataFrame with weights for street types.
         top_weights_percentage (float): Fraction of top-weighted cuts to consider.
-        depth (int): Recursion depth for debugging purposes and printing messages.
+        depth (int): Depth of the input polygon in the tree of cuts, for printing messages.
         _iteration_counter (list[int]): List to keep track of iteration counts for debugging purposes.
+        street_weights (np.ndarray, optional): Precomputed weight of each street (from utils.calculate_street_weights),
+            computed once here if not given.
 
     Returns:
         list[gpd.GeoDataFrame]: List of GeoDataFrames for each resulting polygon piece.
@@ -158,24 +188,84 @@ def cut_single_polygon(
     if _iteration_counter is None:
         _iteration_counter = [0]
 
-    _iteration_counter[0] += 1
-    iteration = _iteration_counter[0]
+    if len(streets) == 0:
+        warnings.warn(f"No streets provided, returning the original polygon (iteration {_iteration_counter[0] + 1})")
+        return [polygon_gdf]
+
+    # ensure data is in the correct CRS
+    # (it is done once here, all pieces are cut with the same metrical streets and addresses
+    # and their spatial indexes)
+    if streets.crs != metrical_crs:
+        streets = streets.to_crs(metrical_crs)
+    if addresses.crs != metrical_crs:
+        addresses = addresses.to_crs(metrical_crs)
+    # (weights of the streets don't change between pieces, so they are computed once for all of them)
+    if street_weights is None:
+        street_weights = utils.calculate_street_weights(streets, weights)
 
+    pieces: list[gpd.GeoDataFrame] = []
+    stack = deque([(polygon_gdf, depth)])
+    while stack:
+        piece_gdf, piece_depth = stack.pop()
+        _iteration_counter[0] += 1
+        result = _cut_polygon_in_two(
+            piece_gdf,
+            streets,
+            addresses,
+            min_addresses,
+            weights,
+            top_weights_percentage,
+            piece_depth,
+            _iteration_counter[0],
+            street_weights
+        )
+        if len(result) == 1:
+            pieces.append(result[0])
+        else:
+            # the second piece is pushed first, so that the first one is cut first
+            stack.extend((piece, piece_depth + 1) for piece in reversed(result))
+
+    return pieces
+
+
+def _cut_polygon_in_two(
+    polygon_gdf: gpd.GeoDataFrame,
+    streets: gpd.GeoDataFrame,
+    addresses: gpd.GeoDataFrame,
+    min_addresses: int,
+    weights: pd.DataFrame,
+    top_weights_percentage: float,
+    depth: int,
+    iteration: int,
+    street_weights: np.ndarray
+) -> list[gpd.GeoDataFrame]:
+    """
+    Splits a polygon in two along the best street route (a single step of cut_single_polygon).
+
+    Args:
+        polygon_gdf (gpd.GeoDataFrame): GeoDataFrame with a single polygon geometry.
+        streets (gpd.GeoDataFrame): GeoDataFrame of street geometries (in the metrical CRS).
+        addresses (gpd.GeoDataFrame): GeoDataFrame of address points (in the metrical CRS).
+        min_addresses (int): Minimum number of addresses required in each resulting part.
+        weights (pd.DataFrame): DataFrame with weights for street types.
+        top_weights_percentage (float): Fraction of top-weighted cuts to consider.
+        depth (int): Depth of the piece in the tree of cuts, for printing messages.
+        iteration (int): Number of the step, for warning messages.
+        street_weights (np.ndarray): Weight of each street (from utils.calculate_street_weights).
+
+    Returns:
+        list[gpd.GeoDataFrame]: The two pieces, or a list with only the input polygon if it can't be cut.
+    """
     if len(polygon_gdf) != 1 or not isinstance(polygon_gdf.geometry.iloc[0], Polygon):
         warnings.warn(f"Input GeoDataFrame must contain exactly one Polygon geometry, returning the original polygon (iteration {iteration})")
         return [polygon_gdf]
-    if len(streets) == 0:
-        warnings.warn("No streets provided, returning the original polygon (iteration {iteration})")
-        return [polygon_gdf]
-    
-    # ensure data is in the correct CRS
+
     polygon_gdf = polygon_gdf.to_crs(metrical_crs)
-    streets = streets.to_crs(metrical_crs)
-    addresses = addresses.to_crs(metrical_crs)
+    polygon = polygon_gdf.geometry.iloc[0]
 
     # define an "n_addresses" column if it doesn't exist
     if "n_addresses" not in polygon_gdf.columns:    
-        polygon_gdf["n_addresses"] = len(utils.addresses_inside_polygon(polygon_gdf.geometry.iloc[0], addresses))
+        polygon_gdf["n_addresses"] = len(utils.addresses_inside_polygon(polygon, addresses))
     if polygon_gdf["n_addresses"].iloc[0] < min_addresses:
         warnings.warn(
             f"Polygon has fewer addresses ({polygon_gdf['n_addresses'].iloc[0]}) than the minimum required ({min_addresses}), returning the original polygon (iteration {iteration})"
@@ -183,59 +273,64 @@ def cut_single_polygon(
         return [polygon_gdf]
 
     # Calculate the boundaries of the polygon and find intersections with streets
-    if not polygon_gdf.geometry.iloc[0].is_valid:
+    if not polygon.is_valid:
         warnings.warn(f"Input polygon is not valid, returning the original polygon (iteration {iteration})")
         return [polygon_gdf]
-    borders = polygon_gdf["geometry"].boundary
-    borders = gpd.GeoDataFrame(geometry=borders, crs=metrical_crs)
-    intersections = inters_logic.find_valid_intersections(borders, streets, weights)
+    borders = gpd.GeoDataFrame(geometry=[polygon.boundary], crs=metrical_crs)
+    intersections = inters_logic.find_valid_intersections(borders, streets, weights, street_weights)
     if len(intersections) < 2:
         if depth == 0:
             print("Not enough intersections found, returning the original polygon")
         return [polygon_gdf]
     
     # Find all routes between intersections
-    cuts = find_all_routes(intersections).to_crs(metrical_crs).loc[:, ["geometry", "weight"]]
+    cuts = find_all_routes(intersections, crs=metrical_crs).loc[:, ["geometry", "weight"]]
     cuts = trim_routes(cuts, polygon_gdf)
 
 
     # add a column for a list of addresses inside each component a cut creates
-    cuts["n_addresses"] = [None for _ in cuts.iterrows()]
-    cuts["result"] = [None for _ in cuts.iterrows()]
-    polygon = polygon_gdf.geometry.iloc[0]
-    for i, row in cuts.iterrows():
-        line = row.geometry
-        result = split(polygon, utils.extend_linestring(line, cfg.streets_extension_distance))
-        cuts.at[i, "n_addresses"] = [
-            len(utils.addresses_inside_polygon(poly, addresses)) for poly in result.geoms
-        ]
-        cuts.at[i, "result"] = result
+    # (addresses in the components of all cuts are counted with a single spatial index query)
+    def split_by_cut(line):
+        return split(polygon, utils.extend_linestring(line, cfg.streets_extension_distance))
+
+    # the splits are independent and GEOS releases the GIL, so they are run in threads
+    if cfg.split_max_workers > 1 and len(cuts) > 1:
+        with ThreadPoolExecutor(max_workers=cfg.split_max_workers) as executor:
+            results = list(executor.map(split_by_cut, cuts.geometry.values))
+    else:
+        results = [split_by_cut(line) for line in cuts.geometry.values]
+    n_pieces = [len(result.geoms) for result in results]
+    n_addresses = utils.count_addresses_inside_polygons([poly for result in results for poly in result.geoms], addresses)
+    offsets = np.cumsum([0] + n_pieces)
+    # (columns are collected as lists, updated by position and assigned to cuts once at the end)
+    cut_n_addresses = [n_addresses[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])]
+    cut_geoms = list(cuts.geometry.values)
+    for k, result in enumerate(results):
         # If the cut results in more than two polygons, merge them based on shared borders
         # and re-calculate the number of addresses in the merged polygons
         if len(result.geoms) > 2:
             gdf = gpd.GeoDataFrame(geometry=list(result.geoms), crs=metrical_crs)
-            gdf["n_addresses"] = cuts.at[i, "n_addresses"]
+            gdf["n_addresses"] = cut_n_addresses[k]
             if any(gdf.nlargest(2, "n_addresses").n_addresses < min_addresses):
                 continue  # Skip cuts that don't result in two large polygons
             main_polys = gdf.nlargest(2, "n_addresses").copy()
             rest = gdf.drop(index=main_polys.index).copy()
-            merged = join_gdfs_longest_border(main_polys, rest)[0]
-            cuts.at[i, "geometry"] = utils.shared_border(
-                merged.geometry.iloc[0], merged.geometry.iloc[1]
-            )
-            cuts.at[i, "result"] = GeometryCollection(list(merged.geometry))
-            cuts.at[i, "n_addresses"] = [
-                len(utils.addresses_inside_polygon(poly, addresses)) for poly in merged.geometry
-            ]
-
-    # Define a function to validate cuts based on address counts
+            merged_geoms = join_gdfs_longest_border(main_polys, rest)[0].geometry.values
+            cut_geoms[k] = utils.shared_border(merged_geoms[0], merged_geoms[1])
+            results[k] = GeometryCollection(list(merged_geoms))
+            cut_n_addresses[k] = utils.count_addresses_inside_polygons(merged_geoms, addresses).tolist()
+    cuts["geometry"] = gpd.GeoSeries(cut_geoms, index=cuts.index, crs=metrical_crs)
+    cuts["n_addresses"] = pd.Series(cut_n_addresses, index=cuts.index, dtype=object)
+    cuts["result"] = pd.Series(results, index=cuts.index, dtype=object)
+
+    # Validate cuts based on address counts (stored as one column per piece)
     # (Check if the cut results in exactly two polygons with sufficient addresses)
-    def cut_is_valid(n_addresses_list: list[int]) -> bool:
-        if len(n_addresses_list) != 2:
-            return False
-        else:
-            return all(n >= min_addresses for n in n_addresses_list)
-    cuts = cuts[[cut_is_valid(lst) for lst in cuts["n_addresses"]]]
+    is_two_pieces = np.array([len(lst) == 2 for lst in cut_n_addresses], dtype=bool)
+    counts = np.zeros((len(cuts), 2), dtype=np.int64)
+    if is_two_pieces.any():
+        counts[is_two_pieces] = [lst for lst, ok in zip(cut_n_addresses, is_two_pieces) if ok]
+    cuts["n_addresses_1"], cuts["n_addresses_2"] = counts[:, 0], counts[:, 1]
+    cuts = cuts[is_two_pieces & (counts >= min_addresses).all(axis=1)]
 
     # If no valid cuts are found, return the original polygon
     if len(cuts) == 0:
@@ -253,20 +348,14 @@ def cut_single_polygon(
         return [polygon_gdf]
 
     # select the best cut based on the difference in address counts (the smaller the better)
-    def addresses_difference(valid_addresses_list: list[int]) -> int:
-        positive_addresses = [x for x in valid_addresses_list if x > 0]
-        if len(positive_addresses) != 2:
-            raise Exception("Valid n_addresses list should contain exactly two positive entries")
-        return abs(positive_addresses[0] - positive_addresses[1])
-    cuts["n_addresses_diff"] = [
-        addresses_difference(row.n_addresses) for _, row in cuts.iterrows()
-    ]
-    best_cut = cuts.loc[cuts["n_addresses_diff"].idxmin()]
-    best_result = best_cut.result
+    if ((cuts["n_addresses_1"] <= 0) | (cuts["n_addresses_2"] <= 0)).any():
+        raise Exception("Valid n_addresses list should contain exactly two positive entries")
+    cuts = cuts.assign(n_addresses_diff=(cuts["n_addresses_1"] - cuts["n_addresses_2"]).abs())
+    best_result = cuts.at[cuts["n_addresses_diff"].idxmin(), "result"]
     
-    # Extract the two polygon pieces
-    poly1_geom = list(best_result.geoms)[0]
-    poly2_geom = list(best_result.geoms)[1]
+    # Extract the two polygon pieces (from the split computed for the cut above)
+    poly1_geom = best_result.geoms[0]
+    poly2_geom = best_result.geoms[1]
     
     # CLEAN ARTIFACTS IMMEDIATELY AFTER CUT
     poly1_geom, poly2_geom = partition_utils.clean_two_pieces_after_cut(
@@ -274,8 +363,10 @@ def cut_single_polygon(
         poly2_geom
     )
     
-    n_addr_1 = len(utils.addresses_inside_polygon(poly1_geom, addresses))
-    n_addr_2 = len(utils.addresses_inside_polygon(poly2_geom, addresses))
+    # Number of addresses in each piece
+    # (the pieces are cut with all the addresses instead of a subset for each piece, so the spatial index
+    # of the addresses is built once and reused, pieces only ever contain addresses of their parent polygon)
+    n_addr_1, n_addr_2 = utils.count_addresses_inside_polygons([poly1_geom, poly2_geom], addresses).tolist()
     
     # Create GeoDataFrames for each piece
     poly1 = gpd.GeoDataFrame(
@@ -292,41 +383,15 @@ def cut_single_polygon(
     )
     
     print(f"Cutting polygon at depth {depth}: {n_addr_1} addresses in first piece, {n_addr_2} in second piece")
-    
-    # Recursively cut each piece (they're already clean!)
-    pieces: list[gpd.GeoDataFrame] = []
-    pieces.extend(
-        cut_single_polygon(
-            poly1,
-            streets,
-            utils.addresses_inside_polygon(poly1.geometry.iloc[0], addresses),
-            min_addresses,
-            weights,
-            top_weights_percentage,
-            depth + 1,
-            _iteration_counter=_iteration_counter
-        )
-    )
-    pieces.extend(
-        cut_single_polygon(
-            poly2,
-            streets,
-            utils.addresses_inside_polygon(poly2.geometry.iloc[0], addresses),
-            min_addresses,
-            weights,
-            top_weights_percentage,
-            depth + 1,
-            _iteration_counter=_iteration_counter
-        )
-    )
-    
-    return pieces
+
+    return [poly1, poly2]
 
 
 def pieces_to_final_data(
     pieces: list[gpd.GeoDataFrame],
     streets: gpd.GeoDataFrame,
     weights: pd.DataFrame,
+    street_weights: np.ndarray | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Combines polygon pieces into a final GeoDataFrame with neighbor and border information.
@@ -336,13 +401,24 @@ def pieces_to_final_data(
         streets (gpd.GeoDataFrame): GeoDataFrame of street geometries.
         addresses (gpd.GeoDataFrame): GeoDataFrame of address points.
         weights (pd.DataFrame): DataFrame with weights for street types.
+        street_weights (np.ndarray, optional): Precomputed weight of each street (from utils.calculate_street_weights).
 
     Returns:
         gpd.GeoDataFrame: Final GeoDataFrame with geometry, id, neighbors, border weights, and address counts.
     """
 
-    # turn pieces into a single GeoDataFrame
-    gdf = pd.concat(pieces, ignore_index=True)
+    # turn pieces into a single GeoDataFrame, built once from the concatenated columns of all pieces
+    # (pieces returned early by cut_single_polygon may lack the "n_addresses" column)
+    gdf = gpd.GeoDataFrame(
+        {
+            "n_addresses": np.concatenate([
+                piece["n_addresses"].to_numpy() if "n_addresses" in piece.columns else np.full(len(piece), np.nan)
+                for piece in pieces
+            ])
+        },
+        geometry=np.concatenate([np.asarray(piece.geometry.values) for piece in pieces]),
+        crs=pieces[0].crs
+    )
 
     # add ids based on spatial sorting
     gdf = utils.sort_polygons_spatially(gdf)
@@ -352,7 +428,7 @@ def pieces_to_final_data(
     # add neighbors based on touching geometries
     gdf = partition_utils.find_neighbors(gdf)
     # add border weights between neighbors
-    gdf = partition_utils.calculate_border_weights(gdf, streets, weights)
+    gdf = partition_utils.calculate_border_weights(gdf, streets, weights, street_weights=street_weights)
 
     # reorder columns
     gdf = gdf[["id", "n_addresses", "geometry", "neighbors", "border_weights"]]
@@ -428,19 +504,21 @@ def partition_polygons(
     osm_keys = weights.osm_key.unique()
     streets = streets[streets[osm_keys].notnull().any(axis=1)]
     print(f"\nFiltered streets to {len(streets)} relevant geometries based on weights and spatial data.")
+    # weights of the streets, computed once for cutting all polygons and weighting their borders
+    street_weights = utils.calculate_street_weights(streets, weights)
 
-    for i, polygon in polygons.iterrows():
-        print(f"\nPartitioning polygon {i + 1}/{len(polygons)}: {polygon[id_column]}")
-        initial_id = polygon[id_column]
+    for i, (initial_id, polygon) in enumerate(zip(polygons[id_column].values, polygons.geometry.values)):
+        print(f"\nPartitioning polygon {i + 1}/{len(polygons)}: {initial_id}")
         pieces = cut_single_polygon(
-            gpd.GeoDataFrame(geometry=[polygon.geometry], crs=metrical_crs),
+            gpd.GeoDataFrame(geometry=[polygon], crs=metrical_crs),
             streets,
-            utils.addresses_inside_polygon(polygon.geometry, addresses),
+            addresses,
             min_addresses,
             weights,
-            top_weights_percentage
+            top_weights_percentage,
+            street_weights=street_weights
         )
-        gdf = pieces_to_final_data(pieces, streets, weights)
+        gdf = pieces_to_final_data(pieces, streets, weights, street_weights)
         gdf["id"] = str(initial_id) + "." + gdf["id"].astype(str).str.zfill(4)
         print(f"Partitioned polygon {initial_id} into {len(gdf)} pieces.")
 
@@ -1,28 +1,56 @@
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+import shapely
 from shapely.geometry import Point, LineString
 from src.logic_config import metrical_crs, min_angle, streets_extension_distance, close_points_treshold, max_number_of_intersections
-from src.utils import extend_linestring
+from src.utils import extend_linestring, calculate_street_weights
 
 
-def azimuth(p1: Point, p2: Point) -> float:
+def azimuth(p1: Point | np.ndarray, p2: Point | np.ndarray) -> float | np.ndarray:
     """
     Returns the azimuth (bearing) in degrees between two points (expected to be in metrical units), measured clockwise from the north.
+    Works element-wise on arrays of points.
 
     Args:
-        p1 (Point): Starting point.
-        p2 (Point): Target point.
+        p1 (Point | np.ndarray): Starting point(s).
+        p2 (Point | np.ndarray): Target point(s).
 
     Returns:
-        float: Azimuth in degrees (0–360).
+        float | np.ndarray: Azimuth in degrees (0–360).
     """
-    dx = p2.x - p1.x
-    dy = p2.y - p1.y
+    dx = shapely.get_x(p2) - shapely.get_x(p1)
+    dy = shapely.get_y(p2) - shapely.get_y(p1)
     angle = np.degrees(np.arctan2(dy, dx)) % 360
     return angle
 
 
+def check_angle(
+    pt: Point | np.ndarray,
+    b: LineString | np.ndarray,
+    s: LineString | np.ndarray
+) -> float | np.ndarray:
+    """
+    Returns the angle in degrees between two lines (g and u) at their intersection point (pt).
+    This is used to filter out near-parallel intersections (small angles), which are often false.
+    Works element-wise on arrays of points and lines (computing all angles with a few vectorized shapely calls).
+    Args:
+        pt (Point | np.ndarray): Intersection point(s).
+        b (LineString | np.ndarray): First geometry (usually a border).
+        s (LineString | np.ndarray): Second geometry (usually a street).
+    Returns:
+        float | np.ndarray: Angle in degrees between the lines at the intersection point (NaN if it can't be computed).
+    """
+    b_proj = shapely.line_locate_point(b, pt)
+    s_proj = shapely.line_locate_point(s, pt)
+    b_near = shapely.line_interpolate_point(b, b_proj + 1)
+    s_near = shapely.line_interpolate_point(s, s_proj + 1)
+    az_b = azimuth(pt, b_near)
+    az_s = azimuth(pt, s_near)
+    diff = np.abs(az_b - az_s)
+    return np.where(diff > 180, 360 - diff, diff)
+
+
 def extend_lines_in_gdf(gdf: gpd.GeoDataFrame, distance: float) -> gpd.GeoDataFrame:
     """
     Extend both ends of all LineString geometries in a GeoDataFrame by a given distance.
@@ -40,7 +68,7 @@ def extend_lines_in_gdf(gdf: gpd.GeoDataFrame, distance: float) -> gpd.GeoDataFr
         raise ValueError("GeoDataFrame must have a projected CRS (e.g., EPSG:3857).")
 
     gdf_extended = gdf.copy()
-    gdf_extended["geometry"] = gdf_extended["geometry"].apply(lambda geom: extend_linestring(geom, distance))
+    gdf_extended["geometry"] = [extend_linestring(geom, distance) for geom in gdf_extended.geometry.values]
 
     return gdf_extended
 
@@ -49,6 +77,7 @@ def find_intersections_with_angle_and_weight(
     borders: gpd.GeoDataFrame,
     streets: gpd.GeoDataFrame,
     weights: pd.DataFrame,
+    street_weights: np.ndarray | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Finds intersection points between area borders and streets, 
@@ -58,104 +87,62 @@ def find_intersections_with_angle_and_weight(
         borders (GeoDataFrame): GeoDataFrame of border lines (LineStrings).
         streets (GeoDataFrame): GeoDataFrame of street lines (LineStrings).
         weights (DataFrame): DataFrame with columns ["osm_key", "osm_value", "weight"] for street weighting.
+        street_weights (np.ndarray, optional): Precomputed weight of each street (from calculate_street_weights),
+            computed here for the intersected streets if not given.
     Returns:
         GeoDataFrame: Points of intersection with an added 'angle' column and 'weight' column.
     """
-    def check_angle(pt: Point, b: LineString, s: LineString) -> float:
-        """
-        Returns the angle in degrees between two lines (g and u) at their intersection point (pt).
-        This is used to filter out near-parallel intersections (small angles), which are often false.
-        Args:
-            pt (Point): Intersection point.
-            b (LineString): First geometry (usually a border).
-            s (LineString): Second geometry (usually a street).
-        Returns:
-            float: Angle in degrees between the lines at the intersection point.
-        """
-        b_proj = b.project(pt)
-        s_proj = s.project(pt)
-        b_near = b.interpolate(b_proj + 1)
-        s_near = s.interpolate(s_proj + 1)
-        az_b = azimuth(pt, b_near)
-        az_s = azimuth(pt, s_near)
-        diff = abs(az_b - az_s)
-        return 360 - diff if diff > 180 else diff
-    
-    def calculate_street_weight(street: gpd.GeoSeries, weights: pd.DataFrame) -> float:
-        """Calculates the weight of a single street based on its attributes and a weights DataFrame.
-        
-        Args:
-            street (GeoSeries): A GeoSeries representing a street with its attributes.
-            weights (pd.DataFrame): DataFrame with columns ["osm_key", "osm_value", "weight"].
-        
-        Returns:
-            float: The calculated weight of the street (sum of all matching weights).
-        """
-        total_weight = 0.0
-        
-        # Iterate through each weight rule
-        for _, weight_row in weights.iterrows():
-            osm_key = weight_row['osm_key']
-            osm_value = weight_row['osm_value']
-            weight = weight_row['weight']
-            
-            # Check if the street has this attribute
-            if osm_key in street.index:
-                street_value = street[osm_key]
-                
-                # Handle None/NaN values
-                if pd.notna(street_value) and street_value == osm_value:
-                    total_weight += weight
-        
-        return total_weight
-
-    
     # Reproject to a metrical CRS for all geometric calculations
-    borders = borders.to_crs(metrical_crs)
-    streets = streets.to_crs(metrical_crs)
+    if borders.crs != metrical_crs:
+        borders = borders.to_crs(metrical_crs)
+    if streets.crs != metrical_crs:
+        streets = streets.to_crs(metrical_crs)
     borders = borders[borders.is_valid] 
-    streets = streets[streets.is_valid]
+    # (subsetting only when needed keeps the spatial index of the streets shared by all cut pieces)
+    if not streets.is_valid.all():
+        is_valid = streets.is_valid.to_numpy()
+        streets = streets[is_valid]
+        if street_weights is not None:
+            street_weights = street_weights[is_valid]
     
-    # Build spatial index on original streets (no extension yet)
-    street_sindex = streets.sindex
-    intersections = []
+    # Find candidate streets near all borders with one bulk spatial index query
+    # (streets whose bounding box overlaps the bounding box of the buffered border)
+    border_geoms = borders.geometry.values
+    search_bounds = shapely.bounds(shapely.buffer(border_geoms, streets_extension_distance))
+    border_idx, street_idx = streets.sindex.query(shapely.box(*search_bounds.T))
+
+    # Only extend the candidate streets (much smaller subset), each of them once
+    candidate_streets, candidate_inverse = np.unique(street_idx, return_inverse=True)
+    extended_candidates = extend_lines_in_gdf(streets.iloc[candidate_streets], streets_extension_distance)
+    extended_streets = extended_candidates.geometry.values[candidate_inverse]
+    pair_borders = border_geoms[border_idx]
+
+    # Intersect all (border, extended street) pairs in a single shapely call
+    candidate_points = shapely.intersection(pair_borders, extended_streets)
+
+    # Only handle simple (non-empty) Point intersections with lineal streets
+    # (angles can't be measured along e.g. polygonal pedestrian areas)
+    is_point = (
+        (shapely.get_type_id(candidate_points) == 0)
+        & ~shapely.is_empty(candidate_points)
+        & np.isin(shapely.get_type_id(extended_streets), [1, 2, 5])
+    )
+
+    # Angles at all intersection points at once (skipping those where it can't be computed)
+    points = candidate_points[is_point]
+    angles = check_angle(points, pair_borders[is_point], extended_streets[is_point])
+    has_angle = ~np.isnan(angles)
+    street_positions = street_idx[is_point][has_angle]
+
+    if not has_angle.any():
+        return gpd.GeoDataFrame(columns=['geometry', 'angle', 'weight'], crs=metrical_crs)
     
-    for _, b_row in borders.iterrows():
-        # Buffer the border to find nearby streets
-        search_buffer = b_row.geometry.buffer(streets_extension_distance)
-        
-        # Use spatial index to find candidate streets
-        possible_matches_index = list(street_sindex.intersection(search_buffer.bounds))
-        possible_matches = streets.iloc[possible_matches_index]
-        
-        # Only extend the candidate streets (much smaller subset)
-        extended_candidates = extend_lines_in_gdf(possible_matches, streets_extension_distance)
-        
-        for idx, s_row in extended_candidates.iterrows():
-            # Check intersection with extended street
-            if b_row.geometry.intersects(s_row.geometry):
-                pt = b_row.geometry.intersection(s_row.geometry)
-                b = b_row.geometry
-                s = s_row.geometry
-                
-                # Only handle simple Point intersections
-                if pt.geom_type != 'Point':
-                    continue
-                
-                try:
-                    angle = check_angle(pt, b, s)
-                    intersections.append({
-                        "geometry": pt,
-                        "angle": angle,
-                        "weight": calculate_street_weight(s_row, weights)
-                    })
-                except Exception:
-                    continue
-    
-    if not intersections:
-        return gpd.GeoDataFrame(columns=['geometry', 'angle'], crs=metrical_crs)
-    
-    gdf = gpd.GeoDataFrame(intersections, crs=metrical_crs)
+    gdf = gpd.GeoDataFrame({"geometry": points[has_angle], "angle": angles[has_angle]}, crs=metrical_crs)
+    # weights of the intersected streets, computed for all of them at once
+    if street_weights is not None:
+        gdf["weight"] = street_weights[street_positions]
+    else:
+        gdf["weight"] = calculate_street_weights(streets.iloc[street_positions], weights)
     return gdf
 
 
@@ -171,10 +158,8 @@ def remove_small_angles(intersections: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     Returns:
         GeoDataFrame: Filtered intersections.
     """
-    return intersections[
-        (intersections.angle >= min_angle) &
-        (intersections.angle <= 180 - min_angle)
-    ]
+    angles = intersections.angle.to_numpy(dtype=np.float64)
+    return intersections[(angles >= min_angle) & (angles <= 180 - min_angle)]
 
 
 def remove_close_points(points: gpd.GeoDataFrame, threshold: float) -> gpd.GeoDataFrame:
@@ -193,38 +178,42 @@ def remove_close_points(points: gpd.GeoDataFrame, threshold: float) -> gpd.GeoDa
         
     '''    
     
+    if points.empty:
+        return points
     if points.crs != metrical_crs:
         points = points.to_crs(metrical_crs)
     
-    geometries = points.geometry
-    sindex = geometries.sindex
-    kept_set = set()
-    rejected = set()
+    geometries = points.geometry.values
+    point_weights = points.weight.to_numpy()
+
+    # All pairs of points closer than threshold (including each point with itself), with one bulk query
+    left, right = points.sindex.query(geometries, predicate="dwithin", distance=threshold)
+    is_close = shapely.distance(geometries[left], geometries[right]) < threshold
+    left, right = left[is_close], right[is_close]
+    order = np.argsort(left, kind="stable")
+    right = right[order]
+    offsets = np.searchsorted(left[order], np.arange(len(points) + 1))
+
+    kept = np.zeros(len(points), dtype=bool)
+    rejected = np.zeros(len(points), dtype=bool)
     
-    for i, geom in enumerate(geometries):
-        if i in rejected or i in kept_set:
+    for i in range(len(points)):
+        if rejected[i] or kept[i]:
             continue
         
         # Find initial cluster around point i
-        candidate_idxs = list(sindex.query(geom.buffer(threshold)))
-        close_points = [j for j in candidate_idxs 
-                       if j not in rejected and j not in kept_set 
-                       and geom.distance(geometries.iloc[j]) < threshold]
+        close_points = right[offsets[i]:offsets[i + 1]]
+        close_points = close_points[~rejected[close_points] & ~kept[close_points]]
         
         # Find the heaviest in this cluster
-        heaviest = max(close_points, key=lambda idx: points.weight.iloc[idx])
-        kept_set.add(heaviest)
+        heaviest = close_points[np.argmax(point_weights[close_points])]
+        kept[heaviest] = True
         
         # NOW: Re-center on the heaviest and reject everything around IT
-        heaviest_geom = geometries.iloc[heaviest]
-        recentered_candidates = list(sindex.query(heaviest_geom.buffer(threshold)))
-        
-        for j in recentered_candidates:
-            if j != heaviest and j not in kept_set:
-                if heaviest_geom.distance(geometries.iloc[j]) < threshold:
-                    rejected.add(j)
+        recentered = right[offsets[heaviest]:offsets[heaviest + 1]]
+        rejected[recentered[~kept[recentered]]] = True
     
-    return points.iloc[list(kept_set)].copy()
+    return points.iloc[np.flatnonzero(kept)].copy()
 
 
 
@@ -232,6 +221,7 @@ def find_valid_intersections(
     borders: gpd.GeoDataFrame,
     streets: gpd.GeoDataFrame,
     weights: pd.DataFrame,
+    street_weights: np.ndarray | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Finds and filters valid intersection points between border and street geometries.
@@ -247,11 +237,12 @@ def find_valid_intersections(
         borders (GeoDataFrame): Cadastral or administrative boundary lines.
         streets (GeoDataFrame): Street centerlines.
         weights (DataFrame): Weights for street attributes.
+        street_weights (np.ndarray, optional): Precomputed weight of each street (from calculate_street_weights).
 
     Returns:
         GeoDataFrame: Cleaned set of intersection points.
     """
-    points = find_intersections_with_angle_and_weight(borders, streets, weights)
+    points = find_intersections_with_angle_and_weight(borders, streets, weights, street_weights)
     points = remove_small_angles(points)
     points = remove_close_points(points, threshold = close_points_treshold)
     if len(points) > max_number_of_intersections:
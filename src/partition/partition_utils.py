@@ -1,9 +1,12 @@
 import geopandas as gpd
 import pandas as pd
+import numpy as np
+import shapely
 from shapely.geometry import Polygon
 from shapely.ops import unary_union
 
 import src.logic_config as cfg
+import src.utils as utils
 
 metrical_crs = cfg.metrical_crs
 
@@ -43,17 +46,18 @@ def find_neighbors(
     # Create a temporary GeoDataFrame with buffered geometry as active geometry
     gdf_buffered = gdf.set_geometry("geom_buffered")
 
-    # Find neighbors based on intersection of buffered geometries
-    neighbors = gpd.sjoin(gdf_buffered, gdf_buffered, how="left", predicate="intersects")
+    # Find neighbors based on intersection of buffered geometries (one bulk spatial index query)
+    left, right = gdf_buffered.sindex.query(gdf_buffered.geometry, predicate="intersects")
+    ids = gdf["id"].to_numpy()
 
     # Filter out self-joins
-    neighbors = neighbors[neighbors.index != neighbors["id_right"]]
+    not_self = gdf.index.to_numpy()[left] != ids[right]
+    left, neighbor_ids = left[not_self], ids[right[not_self]].astype(int)
 
-    # Group neighbors by original index
-    gdf["neighbors"] = neighbors.groupby(neighbors.index)["id_right"].apply(list)
-    gdf["neighbors"] = gdf["neighbors"].apply(
-        lambda x: sorted([int(i) for i in x if not pd.isna(i)]) if isinstance(x, list) else []
-    )
+    # Group neighbors by original index (sorted by id)
+    order = np.lexsort((neighbor_ids, left))
+    splits = np.cumsum(np.bincount(left, minlength=len(gdf)))[:-1]
+    gdf["neighbors"] = [group.tolist() for group in np.split(neighbor_ids[order], splits)]
 
     return gdf
 
@@ -64,6 +68,7 @@ def calculate_border_weights(
     weights: pd.DataFrame,
     buffer: float = cfg.street_buff,
     non_relevant_len: float = cfg.non_relevant_len,
+    street_weights: np.ndarray | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Calculates weighted borders between neighboring polygons based on street intersections.
@@ -74,12 +79,14 @@ def calculate_border_weights(
         weights: DataFrame with columns ["osm_key", "osm_value", "weight"]
         buffer: Buffer distance for the border (not used, kept for compatibility)
         non_relevant_len: Minimum intersection length to consider relevant
+        street_weights: Precomputed weight of each street (from utils.calculate_street_weights), optional
     
     Returns:
         GeoDataFrame with added 'border_weights' column (dict of neighbor_id: weight) and without 'geom_buffered' column.
     """
     # Ensure streets are in correct CRS
-    streets = streets.to_crs(metrical_crs)
+    if streets.crs != metrical_crs:
+        streets = streets.to_crs(metrical_crs)
     
     # Validate weights DataFrame
     for colname in ["osm_key", "osm_value", "weight"]:
@@ -91,98 +98,75 @@ def calculate_border_weights(
         raise ValueError("GeoDataFrame must have 'geom_buffered' column. Run find_neighbors() first.")
     if "neighbors" not in gdf.columns:
         raise ValueError("GeoDataFrame must have 'neighbors' column. Run find_neighbors() first.")
+    if "id" not in gdf.columns:
+        raise ValueError("GeoDataFrame must have 'id' column")
     
-    # Initialize border_weights column
-    gdf["border_weights"] = [{} for _ in range(len(gdf))]
-    
-    # Calculate weights for each polygon and its neighbors
-    for idx, row in gdf.iterrows():
-        neighbor_ids = row["neighbors"]
-        
-        if not neighbor_ids:
-            continue
-        
-        # Use pre-computed buffered geometry
-        poly1_buffered = row["geom_buffered"]
-        
-        border_weights_dict = {}
-        
-        for neighbor_id in neighbor_ids:
-            # Use pre-computed buffered geometry for neighbor
-            poly2_buffered = gdf.loc[neighbor_id, "geom_buffered"]
-            
-            # Get border buffer as intersection of buffered polygons
-            border_buffer = poly1_buffered.intersection(poly2_buffered)
-            
-            # Check if intersection is valid and non-empty
-            if border_buffer.is_empty or border_buffer.area < 1e-8:
-                border_weights_dict[neighbor_id] = 0.0
-                continue
-            
-            # Ensure it's a Polygon
-            if border_buffer.geom_type == 'GeometryCollection':
-                # Extract polygons from collection
-                polys = [g for g in border_buffer.geoms if g.geom_type in ['Polygon', 'MultiPolygon']]
-                if not polys:
-                    border_weights_dict[neighbor_id] = 0.0
-                    continue
-                border_buffer = unary_union(polys)
-            elif border_buffer.geom_type == 'MultiPolygon':
-                border_buffer = unary_union([border_buffer])
-            
-            # Find streets that intersect with the border buffer
-            possible_matches = streets.iloc[
-                streets.sindex.query(border_buffer, predicate="intersects")
-            ]
-            streets_along_border = possible_matches[
-                possible_matches.intersects(border_buffer)
-            ].copy()
-            
-            if streets_along_border.empty:
-                border_weights_dict[neighbor_id] = 0.0
-                continue
-            
-            # Calculate intersection geometries and lengths
-            streets_along_border["intersect_geom"] = streets_along_border.geometry.intersection(
-                border_buffer
-            )
-            streets_along_border["intersect_length"] = streets_along_border["intersect_geom"].length
-            
-            # Filter by minimum length
-            relevant_streets = streets_along_border[
-                streets_along_border.intersect_length >= non_relevant_len
-            ].copy()
-            
-            if relevant_streets.empty:
-                border_weights_dict[neighbor_id] = 0.0
-                continue
-            
-            # Calculate weights for each street
-            relevant_streets = relevant_streets.reset_index(drop=True)
-            relevant_streets["total_weight"] = 0.0
-            
-            # Iterate over each osm_key in weights
-            for key in weights.osm_key.unique():
-                if key not in relevant_streets.columns:
-                    continue
-                
-                arr = relevant_streets[["intersect_length", key]]
-                w = weights[weights.osm_key == key][["osm_value", "weight"]]
-                to_add = pd.merge(arr, w, how="left", left_on=key, right_on="osm_value")
-                relevant_streets["total_weight"] += to_add["weight"].fillna(0).values
-            
-            # Calculate weighted average
-            total_length = relevant_streets["intersect_length"].sum()
-            
-            if total_length == 0:
-                border_weights_dict[neighbor_id] = 0.0
-            else:
-                weighted_sum = (
-                    relevant_streets["total_weight"] * relevant_streets["intersect_length"]
-                ).sum()
-                border_weights_dict[neighbor_id] = float(weighted_sum / total_length)
-        
-        gdf.at[idx, "border_weights"] = border_weights_dict
+    # All (polygon, neighbor) pairs, in the order of the neighbor lists
+    n_neighbors = gdf["neighbors"].apply(len).to_numpy()
+    pair_rows = np.repeat(np.arange(len(gdf)), n_neighbors)
+    pair_neighbor_ids = [neighbor_id for neighbor_ids in gdf["neighbors"] for neighbor_id in neighbor_ids]
+    n_pairs = len(pair_neighbor_ids)
+    pair_weights = np.zeros(n_pairs)
+
+    if n_pairs > 0:
+        # Each border is shared by two polygons (listed as neighbors of each other),
+        # so its weight is computed once for each unordered pair of polygon positions
+        # (neighbor lists hold values of the 'id' column, not index labels)
+        pair_neighbor_rows = pd.Index(gdf["id"]).get_indexer(pair_neighbor_ids)
+        if (pair_neighbor_rows < 0).any():
+            raise ValueError("Neighbor lists contain ids missing from the 'id' column. Run find_neighbors() first.")
+        pair_keys = np.minimum(pair_rows, pair_neighbor_rows) * len(gdf) + np.maximum(pair_rows, pair_neighbor_rows)
+        border_keys, pair_border = np.unique(pair_keys, return_inverse=True)
+        n_borders = len(border_keys)
+        border_weights = np.zeros(n_borders)
+
+        # Border buffers as intersections of pre-computed buffered geometries
+        buffered = np.asarray(gdf["geom_buffered"].values)
+        border_buffers = shapely.intersection(buffered[border_keys // len(gdf)], buffered[border_keys % len(gdf)])
+
+        # Keep only polygonal parts of geometry collections
+        is_collection = shapely.get_type_id(border_buffers) == 7
+        border_buffers[is_collection] = [
+            unary_union([g for g in geom.geoms if g.geom_type in ['Polygon', 'MultiPolygon']])
+            for geom in border_buffers[is_collection]
+        ]
+
+        # Skip empty borders
+        valid_borders = np.flatnonzero(~shapely.is_empty(border_buffers) & (shapely.area(border_buffers) >= 1e-8))
+        border_buffers = border_buffers[valid_borders]
+
+        # Find streets intersecting any border buffer with one spatial index query,
+        # and lengths of their intersections with the border buffers
+        buffer_idx, street_idx = streets.sindex.query(border_buffers, predicate="intersects")
+        intersect_length = shapely.length(
+            shapely.intersection(np.asarray(streets.geometry.values)[street_idx], border_buffers[buffer_idx])
+        )
+
+        # Filter by minimum length
+        relevant = intersect_length >= non_relevant_len
+        border_idx = valid_borders[buffer_idx[relevant]]
+        street_idx = street_idx[relevant]
+        intersect_length = intersect_length[relevant]
+
+        # Calculate weights of the relevant streets (summed over osm keys), unless they are precomputed
+        if street_weights is not None:
+            street_weight = street_weights[street_idx]
+        else:
+            street_weight = utils.calculate_street_weights(streets.iloc[street_idx], weights)
+
+        # Calculate weighted average for each border, and give it to both of its pairs
+        total_length = np.bincount(border_idx, weights=intersect_length, minlength=n_borders)
+        weighted_sum = np.bincount(border_idx, weights=street_weight * intersect_length, minlength=n_borders)
+        np.divide(weighted_sum, total_length, out=border_weights, where=total_length > 0)
+        pair_weights = border_weights[pair_border]
+
+    # Collect weights into dicts of neighbor_id: weight
+    pair_weights = pair_weights.tolist()
+    offsets = np.concatenate([[0], np.cumsum(n_neighbors)]).tolist()
+    gdf["border_weights"] = [
+        dict(zip(pair_neighbor_ids[offsets[i]:offsets[i + 1]], pair_weights[offsets[i]:offsets[i + 1]]))
+        for i in range(len(gdf))
+    ]
 
     # Clean up temporary buffered geometry column
     gdf = gdf.drop(columns=["geom_buffered"])
@@ -205,8 +189,6 @@ def clean_two_pieces_after_cut(
     Returns:
         Tuple of cleaned polygons that fit together perfectly
     """
-    from shapely.ops import unary_union
-    
     # Original union for validation
     original_union = unary_union([poly1_geom, poly2_geom])
     
@@ -1,5 +1,3 @@
-from pathlib import Path
-import json
 from src.handle_database import db_io as db_io
 from src.partition.cuts_logic import partition_polygons
 
@@ -7,8 +5,7 @@ from src.partition.cuts_logic import partition_polygons
 def run_partition(args):
     '''Main function to execute the partitioning process with incremental saving.'''
     # Load configuration
-    with open(Path(args.config).resolve()) as f:
-        config = json.load(f)
+    config = db_io.load_config(args.config)
     
     # Connect to database
     engine_input = db_io.connect(config["input_db"])
@@ -18,7 +15,9 @@ def run_partition(args):
     weights = db_io.load_weights_from_csv(args.weights_path, config["weights"])
     
     # Load all relevant data from the database
-    data = db_io.load_all_data_with_bbox(engine_input, config["data_for_partition"], args)
+    data = db_io.load_all_data_with_bbox(
+        engine_input, config["data_for_partition"], args, osm_keys=list(weights.osm_key.unique())
+    )
     area, addresses, osm_data = data["area"], data["addresses"], data.get("osm_data")
     
     if args.avg:
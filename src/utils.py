@@ -1,20 +1,221 @@
 import geopandas as gpd
+import sqlite3
+import threading
+from functools import lru_cache
 import requests
-import polyline
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import warnings
 import pandas as pd
 from shapely.geometry import Polygon, LineString, MultiLineString, Point
-from shapely.ops import linemerge, unary_union
+from shapely.ops import linemerge
 import numpy as np
 from shapely.geometry import MultiPoint
+import shapely
+import pyproj
+
+try:
+    import orjson as json_parser
+except ImportError:  # orjson is optional, fall back to the standard library parser
+    import json as json_parser
 
 import src.logic_config as cfg
 
 metrical_crs = cfg.metrical_crs
 
 
+def create_osrm_session(pool_size: int = cfg.osrm_max_workers) -> requests.Session:
+    """
+    Creates a requests Session with a connection pool sized for concurrent OSRM requests.
+    Connections are kept alive and reused, failed requests (5xx) are retried.
+    Args:
+        pool_size (int): Maximum number of connections kept in the pool.
+    Returns:
+        requests.Session: Session with an HTTPAdapter mounted for http:// and https://.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# session shared by all OSRM requests (thread-safe for concurrent GET requests)
+osrm_session = create_osrm_session()
+
+
+@lru_cache(maxsize=1)
+def _osrm_disk_cache() -> sqlite3.Connection | None:
+    """Opens the on-disk cache of OSRM responses (once per process), or returns None if it is disabled in logic_config."""
+    if cfg.osrm_cache_path is None:
+        return None
+    conn = sqlite3.connect(cfg.osrm_cache_path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS osrm_routes (key TEXT PRIMARY KEY, routes TEXT)")
+    return conn
+
+
+_osrm_disk_cache_lock = threading.Lock()
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> np.ndarray:
+    """
+    Decodes a polyline (Google's Encoded Polyline Algorithm Format, as returned by OSRM) with numpy,
+    without a Python loop over its characters.
+    Args:
+        encoded (str): The encoded polyline.
+        precision (int): Number of decimal places of the encoded coordinates.
+    Returns:
+        np.ndarray: (n, 2) array of (latitude, longitude) coordinates.
+    """
+    chunks = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    if len(chunks) == 0:
+        return np.empty((0, 2))
+
+    # each value is encoded in 5-bit chunks (least significant first), the 0x20 bit marks continuation
+    ends = np.flatnonzero(chunks < 0x20)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    shifts = 5 * (np.arange(len(chunks)) - np.repeat(starts, ends - starts + 1))
+    values = np.add.reduceat((chunks & 0x1f) << shifts, starts)
+
+    # values are zigzag-encoded differences from the previous coordinate
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / float(10 ** precision)
+
+
+def _fetch_osrm_routes(
+    lon1: float, lat1: float, lon2: float, lat2: float, alternatives: bool | int, session: requests.Session
+) -> list[tuple[np.ndarray, float, float]] | None:
+    """Sends the route request to OSRM and decodes the returned routes (see request_osrm_routes)."""
+    url = (
+        f"{cfg.osrm_url}/route/v1/{cfg.osrm_profile}/"
+        f"{lon1},{lat1};{lon2},{lat2}?overview=full&geometries=polyline&alternatives={str(alternatives).lower()}"
+    )
+    response = session.get(url)
+    data = json_parser.loads(response.content)
+    if data["code"] == "Ok":
+        routes = []
+        for route in data["routes"]:
+            coords_lonlat = decode_polyline(route["geometry"])[:, ::-1]
+            coords_lonlat.flags.writeable = False  # shared through the cache
+            routes.append((coords_lonlat, route["duration"], route["weight"] / route["distance"]))
+        return routes
+    else:
+        print("OSRM Error:", data)
+        return None
+
+
+class _OSRMRouteError(Exception):
+    """Raised (inside the cache) when OSRM returns no routes, so that failures are not cached."""
+
+
+@lru_cache(maxsize=cfg.osrm_memory_cache_size)
+def _cached_osrm_routes(
+    lon1: float, lat1: float, lon2: float, lat2: float, alternatives: bool | int, session: requests.Session
+) -> tuple[tuple[np.ndarray, float, float], ...]:
+    """In-memory cache over the on-disk cache over OSRM requests, keyed by (rounded) coordinates.
+    Raises _OSRMRouteError if OSRM fails (exceptions are not cached, so the request is retried next time)."""
+    key = f"{cfg.osrm_url}/{cfg.osrm_profile};{lon1},{lat1};{lon2},{lat2};{alternatives}"
+    disk_cache = _osrm_disk_cache()
+    if disk_cache is not None:
+        with _osrm_disk_cache_lock:
+            row = disk_cache.execute("SELECT routes FROM osrm_routes WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            routes = []
+            for coords, duration, weight in json_parser.loads(row[0]):
+                coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+                coords.flags.writeable = False
+                routes.append((coords, duration, weight))
+            return tuple(routes)
+
+    routes = _fetch_osrm_routes(lon1, lat1, lon2, lat2, alternatives, session)
+    if routes is None:
+        raise _OSRMRouteError(key)
+    if disk_cache is not None:
+        # stored as plain JSON lists (no pickles read from a file)
+        blob = json_parser.dumps([[coords.tolist(), duration, weight] for coords, duration, weight in routes])
+        if isinstance(blob, bytes):
+            blob = blob.decode()
+        with _osrm_disk_cache_lock:
+            disk_cache.execute("INSERT OR REPLACE INTO osrm_routes (key, routes) VALUES (?, ?)", (key, blob))
+    return tuple(routes)
+
+
+def request_osrm_routes(
+    lon1: float, lat1: float, lon2: float, lat2: float, alternatives: bool | int = False,
+    session: requests.Session = osrm_session
+) -> list[tuple[np.ndarray, float, float]] | None:
+    """
+    Requests a route from OSRM between two coordinates and returns the raw decoded routes.
+    To run this, you need to have an OSRM server running locally (see readme for details).
+    Responses are cached in memory and, if enabled, on disk (see osrm_cache_path in logic_config.py),
+    keyed by coordinates rounded to 6 decimal places (~0.1 m).
+    Args:
+        lon1 (float): Longitude of the start point.
+        lat1 (float): Latitude of the start point.
+        lon2 (float): Longitude of the end point.
+        lat2 (float): Latitude of the end point.
+        alternatives (bool | int): Whether to request alternative routes. If int, specifies the number of alternatives.
+        session (requests.Session): Session used for the request (defaults to the shared pooled session).
+    Returns:
+        list[tuple[np.ndarray, float, float]] | None: One (coordinates, duration, normalized weight) tuple per route,
+        where coordinates is a read-only (n, 2) array of longitudes and latitudes, or None if OSRM fails.
+    """
+    try:
+        routes = _cached_osrm_routes(
+            round(lon1, 6), round(lat1, 6), round(lon2, 6), round(lat2, 6), alternatives, session
+        )
+    except _OSRMRouteError:
+        return None
+    return list(routes)
+
+
+@lru_cache(maxsize=None)
+def get_transformer(crs_from, crs_to) -> pyproj.Transformer | None:
+    """Returns a (cached) pyproj Transformer between two CRS, with x/y (lon/lat) axis order, or None if both CRS are the same."""
+    if pyproj.CRS(crs_from) == pyproj.CRS(crs_to):
+        return None
+    return pyproj.Transformer.from_crs(crs_from, crs_to, always_xy=True)
+
+
+def transform_coords(coords: np.ndarray, crs_from, crs_to) -> np.ndarray:
+    """
+    Reprojects an (n, 2) array of x/y (lon/lat) coordinates directly with pyproj, without building a GeoSeries.
+    Args:
+        coords (np.ndarray): (n, 2) coordinate array in crs_from.
+        crs_from: CRS of the coordinates.
+        crs_to: Target CRS.
+    Returns:
+        np.ndarray: (n, 2) coordinate array in crs_to (the input array if both CRS are the same).
+    """
+    transformer = get_transformer(crs_from, crs_to)
+    if transformer is None:
+        return coords
+    return np.column_stack(transformer.transform(coords[:, 0], coords[:, 1]))
+
+
+def linestrings_from_coords(coords: list[np.ndarray]) -> np.ndarray:
+    """
+    Builds LineStrings from a list of coordinate arrays in a single shapely call.
+    Args:
+        coords (list[np.ndarray]): (n, 2) coordinate arrays, one per LineString.
+    Returns:
+        np.ndarray: Array of LineStrings.
+    """
+    if len(coords) == 0:
+        return np.empty(0, dtype=object)
+    indices = np.repeat(np.arange(len(coords)), [len(c) for c in coords])
+    return shapely.linestrings(np.concatenate(coords), indices=indices)
+
+
 def get_osrm_route(
-    lon1: float, lat1: float, lon2: float, lat2: float, alternatives: bool | int = False
+    lon1: float, lat1: float, lon2: float, lat2: float, alternatives: bool | int = False,
+    session: requests.Session = osrm_session
 ) -> gpd.GeoDataFrame | None:
     """
     Requests a route from OSRM between two coordinates and returns it as a GeoDataFrame.
@@ -25,43 +226,79 @@ def get_osrm_route(
         lon2 (float): Longitude of the end point.
         lat2 (float): Latitude of the end point.
         alternatives (bool | int): Whether to request alternative routes. If int, specifies the number of alternatives.
+        session (requests.Session): Session used for the request (defaults to the shared pooled session).
     Returns:
         gpd.GeoDataFrame | None: GeoDataFrame with the route LineString(s), duration and normalized weight, or None if OSRM fails.
         (in crs EPSG:4326). Each row represents one route.
     """
+    routes = request_osrm_routes(lon1, lat1, lon2, lat2, alternatives, session)
+    if routes is None:
+        return None
+    coords, durations, weights = zip(*routes)
+    return gpd.GeoDataFrame(
+        {
+            "geometry": linestrings_from_coords(coords),
+            "duration": list(durations),
+            "weight": list(weights)
+        },
+        crs="EPSG:4326"
+    )
+
+
+def get_osrm_durations(
+    lon: float, lat: float, destinations: list[tuple[float, float]],
+    session: requests.Session = osrm_session
+) -> list[float] | None:
+    """
+    Requests the durations of routes from one point to several destinations with a single OSRM table request.
+    To run this, you need to have an OSRM server running locally (see readme for details).
+    Args:
+        lon (float): Longitude of the start point.
+        lat (float): Latitude of the start point.
+        destinations (list[tuple[float, float]]): (longitude, latitude) of the end points.
+        session (requests.Session): Session used for the request (defaults to the shared pooled session).
+    Returns:
+        list[float] | None: Route duration to each destination (inf if there is no route), or None if OSRM fails.
+    """
+    coords = ";".join(f"{x},{y}" for x, y in [(lon, lat), *destinations])
+    destination_indices = ";".join(str(i) for i in range(1, len(destinations) + 1))
     url = (
-        f"http://localhost:5000/route/v1/driving/"
-        f"{lon1},{lat1};{lon2},{lat2}?overview=full&geometries=polyline&alternatives={str(alternatives).lower()}"
+        f"{cfg.osrm_url}/table/v1/{cfg.osrm_profile}/"
+        f"{coords}?sources=0&destinations={destination_indices}&annotations=duration"
     )
-    response = requests.get(url)
-    data = response.json()
+    response = session.get(url)
+    data = json_parser.loads(response.content)
     if data["code"] == "Ok":
-        geometries = []
-        durations = []
-        weights = []
-        
-        for route in data["routes"]:
-            geom = route["geometry"]
-            coords_latlon = polyline.decode(geom)
-            coords_lonlat = [(lon, lat) for lat, lon in coords_latlon]
-            geometries.append(LineString(coords_lonlat))
-            durations.append(route["duration"])
-            weights.append(route["weight"] / route["distance"])
-        
-        gdf = gpd.GeoDataFrame(
-            {
-                "geometry": geometries,
-                "duration": durations,
-                "weight": weights
-            },
-            crs="EPSG:4326"
-        )
-        return gdf
+        return [float("inf") if duration is None else duration for duration in data["durations"][0]]
     else:
         print("OSRM Error:", data)
         return None
 
 
+def calculate_street_weights(streets: pd.DataFrame, weights: pd.DataFrame) -> np.ndarray:
+    """
+    Calculates the weight of each street as the sum of the weights of its OSM tags (with a categorical lookup per key).
+
+    Args:
+        streets (pd.DataFrame): DataFrame with a column for each OSM key (e.g. "highway"), keys missing from it are skipped.
+        weights (pd.DataFrame): DataFrame with columns ["osm_key", "osm_value", "weight"].
+
+    Returns:
+        np.ndarray: Weight of each street (in the order of rows), 0 for streets without weighted tags.
+    """
+    total_weight = np.zeros(len(streets))
+    # (repeated tags are summed and tags without a value skipped, as categories must be unique and non-null)
+    weights = weights.dropna(subset=["osm_value"]).groupby(["osm_key", "osm_value"], sort=False)["weight"].sum().reset_index()
+    for key, key_weights in weights.groupby("osm_key", sort=False):
+        if key not in streets.columns:
+            continue
+        # codes of the street values among the weighted values of the key (-1 for values without a weight),
+        # used to gather the weights from an array with an appended 0 for the -1 code
+        codes = pd.Categorical(streets[key], categories=key_weights["osm_value"]).codes
+        total_weight += np.append(np.nan_to_num(key_weights["weight"].to_numpy(dtype=np.float64)), 0.0)[codes]
+    return total_weight
+
+
 def calculate_weight_by_buffer(
     line: gpd.GeoDataFrame,
     geoms_set: gpd.GeoDataFrame,
@@ -84,9 +321,9 @@ def calculate_weight_by_buffer(
     """
 
 
-    # ensure line and geoms_set are in the correct CRS (metrical units)
-    line_metric = line.to_crs(metrical_crs)
-    geoms_set_metric = geoms_set.to_crs(metrical_crs)
+    # ensure line and geoms_set are in the correct CRS (metrical units), skipping reprojection if they already are
+    line_metric = line if line.crs == metrical_crs else line.to_crs(metrical_crs)
+    geoms_set_metric = geoms_set if geoms_set.crs == metrical_crs else geoms_set.to_crs(metrical_crs)
 
     # ensure weights DataFrame has the required columns
     for colname in ["osm_key", "osm_value", "weight"]:
@@ -101,12 +338,14 @@ def calculate_weight_by_buffer(
         buffered_line = buffered_line.union_all()
 
     # find geometries that intersect with the buffered line
-    possible_matches = geoms_set_metric.iloc[
+    # (the spatial index query tests the exact predicate, the prepared buffer speeds up the intersection tests)
+    shapely.prepare(buffered_line)
+    geoms_along_line = geoms_set_metric.iloc[
         geoms_set_metric.sindex.query(buffered_line, predicate="intersects")
-    ]
-    geoms_along_line = possible_matches[possible_matches.intersects(buffered_line)]
-    geoms_along_line["intersect_geom"] = geoms_along_line.geometry.intersection(buffered_line)
-    geoms_along_line["intersect_length"] = geoms_along_line["intersect_geom"].length
+    ].copy()
+    geoms_along_line["intersect_length"] = shapely.length(
+        shapely.intersection(geoms_along_line.geometry.values, buffered_line)
+    )
     relevant_geoms = geoms_along_line[geoms_along_line.intersect_length >= non_relevant_len].copy()
 
     # if no relevant geometries found, return 0.0
@@ -116,26 +355,17 @@ def calculate_weight_by_buffer(
     
     # calculate total weight for each geometry based on the weights DataFrame
     relevant_geoms = relevant_geoms.reset_index(drop=True)
-    relevant_geoms["total_weight"] = 0
-
-    # iterate over each osm_key in weights and calculate the total weight
     for key in weights.osm_key.unique():
-        try:
-            arr = relevant_geoms[["intersect_length", key]]
-        except KeyError:
+        if key not in relevant_geoms.columns:
             warnings.warn(f"Key '{key}' not found in geometries dataframe, skipping.")
-            continue
-        w = weights[weights.osm_key == key][["osm_value", "weight"]]
-        to_add = pd.merge(arr, w, how="left", left_on=key, right_on="osm_value")
-        relevant_geoms.total_weight = relevant_geoms.total_weight.values + to_add.weight.fillna(0).values
+    total_weight = calculate_street_weights(relevant_geoms, weights)
+    intersect_length = relevant_geoms["intersect_length"].to_numpy()
     
-    if sum(relevant_geoms.intersect_length) == 0:
+    total_length = intersect_length.sum()
+    if total_length == 0:
         # warnings.warn("Total intersect length is zero, returning 0.0 for weight.")  
         return 0.0
-    return float(
-        sum(relevant_geoms.total_weight * relevant_geoms.intersect_length)
-        / sum(relevant_geoms.intersect_length)
-    )
+    return float(np.dot(total_weight, intersect_length) / total_length)
 
 
 
@@ -152,10 +382,25 @@ def addresses_inside_polygon(
     Returns:
         gpd.GeoDataFrame: Subset of addresses within the polygon.
     """
-    possible_matches = addresses.iloc[
-        addresses.geometry.sindex.query(polygon, predicate="contains")
-    ]
-    return possible_matches[possible_matches.within(polygon)]
+    # the "contains" predicate is evaluated exactly by the spatial index query (not only on bounding boxes)
+    return addresses.iloc[addresses.geometry.sindex.query(polygon, predicate="contains")]
+
+
+def count_addresses_inside_polygons(
+    polygons: list[Polygon] | np.ndarray, addresses: gpd.GeoDataFrame
+) -> np.ndarray:
+    """
+    Counts addresses located within each of the given polygons, with a single bulk spatial index query.
+
+    Args:
+        polygons (list[Polygon] | np.ndarray): The polygon geometries.
+        addresses (gpd.GeoDataFrame): GeoDataFrame of address points.
+
+    Returns:
+        np.ndarray: Number of addresses within each polygon.
+    """
+    polygon_idx, _ = addresses.geometry.sindex.query(np.asarray(polygons, dtype=object), predicate="contains")
+    return np.bincount(polygon_idx, minlength=len(polygons))
 
 
 
@@ -212,16 +457,12 @@ def sort_outer_polygons_spatially(gdf: gpd.GeoDataFrame, how:str, pts = None) ->
         gdf_sorted = gdf_sorted.to_crs(gdf.crs)
         
     elif how == 'angle':
-        def compute_angle(point, origin):
-            dx = point.x - origin.x
-            dy = point.y - origin.y
-            angle = np.arctan2(dy, dx)
-            return angle
-        gdf_sorted["centroid"] = gdf_sorted.geometry.centroid
-        origin = MultiPoint(gdf_sorted["centroid"].tolist()).centroid
-        gdf_sorted["angle"] = gdf_sorted["centroid"].apply(lambda p: compute_angle(p, origin))
+        # Sort polygons by angle of their centroids around the centroid of all of them
+        centroids = shapely.get_coordinates(gdf_sorted.geometry.centroid.values)
+        origin_x, origin_y = shapely.get_coordinates(shapely.multipoints(centroids).centroid)[0]
+        gdf_sorted["angle"] = np.arctan2(centroids[:, 1] - origin_y, centroids[:, 0] - origin_x)
         gdf_sorted = gdf_sorted.sort_values("angle", ascending=False)
-        gdf_sorted = gdf_sorted.drop(columns=["centroid", "angle"])
+        gdf_sorted = gdf_sorted.drop(columns=["angle"])
     
     gdf_sorted = gdf_sorted.to_crs(gdf.crs)
     polygons_union = gdf_sorted.geometry.union_all()
@@ -248,23 +489,41 @@ def sort_polygons_spatially(gdf: gpd.GeoDataFrame, how = 'angle', pts = None) ->
     """
     outer_polygons, remaining = sort_outer_polygons_spatially(gdf, how, pts)
     gdf_sorted = outer_polygons.copy()
+    if len(remaining) == 0:
+        return gdf_sorted
+
+    # Layers are found by a breadth-first search over the touching polygons (found with a single spatial index query):
+    # a polygon touches the outer border of the already sorted polygons exactly when it touches one of them,
+    # and all polygons touching earlier layers are already sorted, so only neighbors of the last layer are checked
+    geoms = np.concatenate([np.asarray(outer_polygons.geometry.values), np.asarray(remaining.geometry.values)])
+    left, right = shapely.STRtree(geoms).query(geoms, predicate="touches")
+    order = np.argsort(left, kind="stable")
+    right = right[order]
+    starts = np.searchsorted(left[order], np.arange(len(geoms) + 1))
+
+    layers = [gdf_sorted]
+    last_layer = np.arange(len(outer_polygons))
+    remaining_pos = np.arange(len(outer_polygons), len(geoms))
     while len(remaining) > 0:
         prev_len = len(remaining)
-        polygons_union = gdf_sorted.geometry.union_all()
-        outer_border = polygons_union.boundary
-        outer_polygons = remaining[remaining.geometry.touches(outer_border)].copy()
-        gdf_sorted = pd.concat([gdf_sorted, outer_polygons], ignore_index=True)
-        remaining = remaining.drop(index=outer_polygons.index)
-        gdf_sorted = gdf_sorted.reset_index(drop=True)
+        touches_last_layer = np.zeros(len(geoms), dtype=bool)
+        neighbors = [right[starts[i]:starts[i + 1]] for i in last_layer]
+        if neighbors:
+            touches_last_layer[np.concatenate(neighbors)] = True
+        is_outer = touches_last_layer[remaining_pos]
+        layers.append(remaining[is_outer])
+        last_layer = remaining_pos[is_outer]
+        remaining = remaining[~is_outer]
+        remaining_pos = remaining_pos[~is_outer]
 
         if len(remaining) == prev_len and len(remaining) > 0:
             warnings.warn(f"No more outer polygons found, stopping sorting.\nNumber of remaining polygons: {len(remaining)}")
-            gdf_sorted = pd.concat([gdf_sorted, remaining], ignore_index=True)
+            layers.append(remaining)
             break
         elif len(remaining) == 0:
             print("All polygons sorted successfully.")
             break
-    return gdf_sorted
+    return pd.concat(layers, ignore_index=True)
 
 
 
@@ -0,0 +1,28 @@
+import geopandas as gpd
+import pandas as pd
+import shapely
+from shapely.geometry import LineString, Polygon
+
+from src.logic_config import metrical_crs
+from src.partition.intersections_logic import find_intersections_with_angle_and_weight
+
+
+def test_polygonal_street_is_skipped():
+    borders = gpd.GeoDataFrame(geometry=[LineString([(0, 0), (1000, 0)])], crs=metrical_crs)
+    streets = gpd.GeoDataFrame(
+        {"highway": ["primary", "pedestrian"]},
+        geometry=[
+            LineString([(500, -100), (500, 100)]),
+            # pedestrian area touching the border at a vertex
+            Polygon([(300, 0), (320, 50), (280, 50)]),
+        ],
+        crs=metrical_crs,
+    )
+    weights = pd.DataFrame({"osm_key": ["highway"], "osm_value": ["primary"], "weight": [2.0]})
+
+    result = find_intersections_with_angle_and_weight(borders, streets, weights)
+
+    assert len(result) == 1
+    assert shapely.equals(result.geometry.iloc[0], shapely.Point(500, 0))
+    assert abs(result["angle"].iloc[0] - 90) < 1e-6
+    assert result["weight"].iloc[0] == 2.0